@@ -9,34 +9,178 @@ This script automatically fetches data from Google Sheets and analyzes:
 The script maps selections back to actual strategies using tournament_mapping.json.
 """
 
+import argparse
 import json
 import os
 import pickle
+import sys
 import csv
 from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Tuple
 from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 import re
+from datetime import datetime
+from functools import lru_cache
+from itertools import chain
+
+from token_store import save_token
+
+try:
+    import orjson
+except ImportError:  # optional; falls back to the stdlib encoder
+    orjson = None
+
+
+# Comment categorization keywords (problems are checked before strengths)
+PROBLEM_KEYWORDS = [
+    'missing', 'incorrect', 'wrong', 'error', 'mistake', 'failed', 'not',
+    'doesn\'t', 'don\'t', 'issue', 'problem', 'bad', 'poor', 'lacks',
+    'too short', 'too long', 'confusing', 'unclear'
+]
+
+STRENGTH_KEYWORDS = [
+    'good', 'better', 'best', 'great', 'excellent', 'correct', 'accurate',
+    'proper', 'well', 'perfect', 'optimal', 'happy medium'
+]
+
+# Keywords to look for in comments
+THEME_KEYWORDS = {
+    'missing_components': ['missing', 'lacks', 'doesn\'t include', 'absent', 'no keyphrase', 'no question', 'missing cri'],
+    'chunk_length': ['too short', 'too long', 'chunk', 'length', 'short chunks', 'long chunks'],
+    'formatting': ['format', 'formatting', 'layout', 'structure', 'organized'],
+    'questions_cri': ['question', 'questions', 'constructed response', 'cri', 'keyphrase', 'assessment'],
+    'chunking_strategy': ['chunking', 'chunks', 'divided', 'paragraphs', 'segmentation'],
+    'accuracy': ['accurate', 'correct', 'wrong', 'error', 'mistake', 'incorrect', 'follows'],
+    'content_issues': ['text', 'content', 'includes', 'excludes', 'page numbers', 'boxed numbers'],
+    'reference_summary': ['reference', 'summary', 'references', 'invented'],
+    'clarity': ['clear', 'clarity', 'readable', 'understandable', 'confusing', 'unclear', 'reading'],
+    'completeness': ['complete', 'incomplete', 'all', 'necessary', 'components'],
+}
+
+
+def _keyword_pattern(keywords: List[str]) -> re.Pattern:
+    """
+    Compile a keyword list into one alternation regex (plain substring semantics).
+    """
+    return re.compile('|'.join(re.escape(keyword) for keyword in keywords))
+
+
+PROBLEM_PATTERN = _keyword_pattern(PROBLEM_KEYWORDS)
+STRENGTH_PATTERN = _keyword_pattern(STRENGTH_KEYWORDS)
+THEME_PATTERNS = {theme: _keyword_pattern(keywords) for theme, keywords in THEME_KEYWORDS.items()}
+
+# Actual (unshuffled) strategy names, in report order
+ALL_STRATEGIES = ('strategy1', 'strategy2', 'strategy3')
+
+# Accepted answers to the interactive "Selected column" prompt
+VALID_COLUMN_RESPONSES = frozenset({'1', '2', '3'})
+
+# Mentions of a shuffled column in evaluator comments, e.g. "Strategy 2"
+STRATEGY_MENTION_PATTERN = re.compile(r'\b[Ss]trategy\s*([123])\b')
+
+# Sheet column label -> position in a textbook's shuffled strategy mapping
+COLUMN_INDEX = {
+    'Strategy 1': 0,
+    'Strategy 2': 1,
+    'Strategy 3': 2
+}
+
+
+# Retries (with exponential backoff) for transient Sheets 429/5xx errors
+SHEETS_NUM_RETRIES = 5
+
+# Inputs and outputs live next to this script
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+MAPPING_FILE = os.path.join(SCRIPT_DIR, 'tournament_mapping.json')
+RESULTS_JSON_FILE = os.path.join(SCRIPT_DIR, 'tournament_results.json')
+RESULTS_MARKDOWN_FILE = os.path.join(SCRIPT_DIR, 'tournament_results.md')
+COMMENTS_FILE = os.path.join(SCRIPT_DIR, 'tournament_comments.txt')
+STRATEGY_COMMENTS_FILE = os.path.join(SCRIPT_DIR, 'comments_by_strategy.txt')
+
+# Section rule used in the plain-text comment exports
+SEPARATOR_LINE = "=" * 80 + "\n"
+
+# Skeleton of tournament_results.md; the {rankings}, {textbook_results} and
+# {comment_sections} blocks are pre-joined by generate_markdown_report
+MARKDOWN_REPORT_TEMPLATE = """\
+# Prompt Tournament Results
+
+**Date**: {date}
+
+## Executive Summary
+
+- **Total Evaluators**: {total_evaluators}
+- **Total Textbooks**: {total_textbooks}
+- **Total Votes Cast**: {total_votes_cast}
+- **Total Comments**: {total_comments}
+
+### 🏆 Winner: {winner_name}
+
+- **{winner_votes}** votes out of {total_votes_cast} ({winner_percentage:.1f}%)
+- Won **{winner_textbooks}** out of {total_textbooks} textbooks
+
+## Strategy Rankings
+
+### By Total Votes
+
+{rankings}\
+## Detailed Results by Textbook
+
+{textbook_results}\
+## Annotator Comments Analysis
+
+**Total Comments**: {total_comments}
+
+{comment_sections}"""
+
+# Credentials and Sheets service are built once per process and reused
+_CREDS = None
+_SERVICE = None
 
 
 def get_google_sheets_credentials():
     """
     Get Google Sheets API credentials.
+    
+    The credentials are cached for the lifetime of the process; the token
+    file is only read again once the cached credentials stop being valid.
     """
     from google_auth_oauthlib.flow import InstalledAppFlow
     
+    global _CREDS, _SERVICE
+    
+    if _CREDS is not None:
+        if _CREDS.valid:
+            return _CREDS
+        # Refresh ahead of use when the cached access token has expired
+        if _CREDS.expired and _CREDS.refresh_token:
+            try:
+                _CREDS.refresh(Request())
+                return _CREDS
+            except Exception as e:
+                print(f"Error refreshing credentials: {e}")
+        _CREDS = None
+    
     SCOPES = ['https://www.googleapis.com/auth/spreadsheets.readonly']
     creds = None
-    token_path = os.path.join(os.path.dirname(__file__), 'token.pickle')
-    credentials_path = os.path.join(os.path.dirname(__file__), 'client_secret_292793864190-84u88cqm6319v0aa1ufnj9l416f98pi8.apps.googleusercontent.com.json')
+    token_path = os.path.join(SCRIPT_DIR, 'token.json')
+    legacy_token_path = os.path.join(SCRIPT_DIR, 'token.pickle')
+    credentials_path = os.path.join(SCRIPT_DIR, 'client_secret_292793864190-84u88cqm6319v0aa1ufnj9l416f98pi8.apps.googleusercontent.com.json')
     
     # Token file stores the user's access and refresh tokens
     if os.path.exists(token_path):
-        with open(token_path, 'rb') as token:
+        # Keep the scopes stored in the token: prompt_tournament.py shares this file
+        # and needs write access, so it must not be narrowed to SCOPES on save
+        creds = Credentials.from_authorized_user_file(token_path)
+    elif os.path.exists(legacy_token_path):
+        # One-time migration from the old pickled token; saved as JSON below
+        with open(legacy_token_path, 'rb') as token:
             creds = pickle.load(token)
+        save_token(creds, token_path)
     
     # If there are no (valid) credentials available, let the user log in.
     if not creds or not creds.valid:
@@ -44,8 +188,7 @@ def get_google_sheets_credentials():
             try:
                 creds.refresh(Request())
                 # Save the refreshed credentials
-                with open(token_path, 'wb') as token:
-                    pickle.dump(creds, token)
+                save_token(creds, token_path)
             except Exception as e:
                 print(f"Error refreshing credentials: {e}")
                 print("Attempting to re-authenticate...")
@@ -63,12 +206,26 @@ def get_google_sheets_credentials():
             creds = flow.run_local_server(port=0)
             
             # Save the credentials for the next run
-            with open(token_path, 'wb') as token:
-                pickle.dump(creds, token)
+            save_token(creds, token_path)
     
+    # New credentials invalidate any service bound to the old ones
+    _CREDS = creds
+    _SERVICE = None
     return creds
 
 
+def get_sheets_service():
+    """
+    Get the Google Sheets API service, building it on first use.
+    """
+    global _SERVICE
+    
+    creds = get_google_sheets_credentials()
+    if _SERVICE is None:
+        _SERVICE = build('sheets', 'v4', credentials=creds)
+    return _SERVICE
+
+
 def load_tournament_mapping(mapping_file: str = None) -> Dict:
     """
     Load the tournament mapping file that shows which strategy is in which column.
@@ -80,7 +237,7 @@ def load_tournament_mapping(mapping_file: str = None) -> Dict:
         Dictionary with spreadsheet_url and list of textbooks with mappings
     """
     if mapping_file is None:
-        mapping_file = os.path.join(os.path.dirname(__file__), 'tournament_mapping.json')
+        mapping_file = MAPPING_FILE
     
     if not os.path.exists(mapping_file):
         raise FileNotFoundError(
@@ -88,26 +245,46 @@ def load_tournament_mapping(mapping_file: str = None) -> Dict:
             "Please ensure tournament_mapping.json exists in the src/ directory."
         )
     
+    # Cached per (path, mtime) so repeated loads skip re-parsing an unchanged file
+    return _load_tournament_mapping_cached(mapping_file, os.stat(mapping_file).st_mtime_ns)
+
+
+@lru_cache(maxsize=1)
+def _load_tournament_mapping_cached(mapping_file: str, mtime_ns: int) -> Dict:
+    """
+    Parse the tournament mapping file; mtime_ns only keys the cache.
+    """
     with open(mapping_file, 'r', encoding='utf-8') as f:
-        return json.load(f)
+        mapping_data = json.load(f)
+    
+    # Intern names that are used as dict keys so lookups hit the identity fast path
+    for item in mapping_data.get('textbooks', []):
+        item['textbook'] = sys.intern(item['textbook'])
+        item['mapping'] = [sys.intern(strategy) for strategy in item['mapping']]
+    
+    return mapping_data
 
 
-def get_all_sheet_names(spreadsheet_id: str) -> List[str]:
+def get_all_sheet_names(spreadsheet_id: str, service=None) -> List[str]:
     """
     Get all sheet tab names from a Google Spreadsheet.
     
     Args:
         spreadsheet_id: The Google Sheets ID
+        service: Optional Sheets API service to reuse (built if omitted)
     
     Returns:
         List of sheet names
     """
     try:
-        creds = get_google_sheets_credentials()
-        service = build('sheets', 'v4', credentials=creds)
+        if service is None:
+            service = get_sheets_service()
         
         # Get spreadsheet metadata
-        spreadsheet = service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
+        spreadsheet = service.spreadsheets().get(
+            spreadsheetId=spreadsheet_id,
+            fields='sheets.properties.title'
+        ).execute(num_retries=SHEETS_NUM_RETRIES)
         sheets = spreadsheet.get('sheets', [])
         
         sheet_names = [sheet['properties']['title'] for sheet in sheets]
@@ -118,27 +295,42 @@ def get_all_sheet_names(spreadsheet_id: str) -> List[str]:
         return []
 
 
-def fetch_sheet_data(spreadsheet_id: str, sheet_name: str = "Sheet1") -> List[List[str]]:
+def sheet_range(sheet_name: str) -> str:
+    """
+    Build the A1 range covering the evaluation columns of a sheet tab.
+    
+    Args:
+        sheet_name: Name of the sheet tab
+    
+    Returns:
+        A1 notation range (columns A through H, Textbook to Comments)
+    """
+    return f"'{sheet_name}'!A:H"
+
+
+def fetch_sheet_data(spreadsheet_id: str, sheet_name: str = "Sheet1", service=None) -> List[List[str]]:
     """
     Fetch data from Google Sheets.
     
     Args:
         spreadsheet_id: The Google Sheets ID
         sheet_name: Name of the sheet tab (default: "Sheet1")
+        service: Optional Sheets API service to reuse (built if omitted)
     
     Returns:
         List of rows from the sheet
     """
     try:
-        creds = get_google_sheets_credentials()
-        service = build('sheets', 'v4', credentials=creds)
+        if service is None:
+            service = get_sheets_service()
         
         # Fetch all data from the sheet
-        range_name = f"'{sheet_name}'!A:H"  # Columns A through H (Textbook to Comments)
         result = service.spreadsheets().values().get(
             spreadsheetId=spreadsheet_id,
-            range=range_name
-        ).execute()
+            range=sheet_range(sheet_name),
+            majorDimension='ROWS',
+            fields='values'
+        ).execute(num_retries=SHEETS_NUM_RETRIES)
         
         values = result.get('values', [])
         return values
@@ -148,18 +340,37 @@ def fetch_sheet_data(spreadsheet_id: str, sheet_name: str = "Sheet1") -> List[Li
         return []
 
 
+def is_reference_sheet(sheet_name: str) -> bool:
+    """
+    Check whether a tab is a mapping/reference sheet rather than an evaluator sheet.
+    
+    Args:
+        sheet_name: Name of the sheet tab
+    
+    Returns:
+        True if the tab should be skipped
+    """
+    name_lower = sheet_name.lower()
+    return 'mapping' in name_lower or 'reference' in name_lower
+
+
 def fetch_all_sheets_data(spreadsheet_id: str) -> Dict[str, List[List[str]]]:
     """
     Fetch data from all sheets in the spreadsheet.
     
+    All evaluator tabs are read with a single values.batchGet request instead
+    of one round-trip per tab.
+    
     Args:
         spreadsheet_id: The Google Sheets ID
     
     Returns:
         Dictionary mapping sheet name to sheet data
     """
+    service = get_sheets_service()
+    
     # Get all sheet names
-    sheet_names = get_all_sheet_names(spreadsheet_id)
+    sheet_names = get_all_sheet_names(spreadsheet_id, service=service)
     
     if not sheet_names:
         return {}
@@ -168,16 +379,34 @@ def fetch_all_sheets_data(spreadsheet_id: str) -> Dict[str, List[List[str]]]:
           (f" and {len(sheet_names) - 5} more..." if len(sheet_names) > 5 else ""))
     print()
     
-    # Fetch data from each sheet
-    all_data = {}
+    # Decide which tabs to fetch before any values are requested
+    kept_names = []
     for sheet_name in sheet_names:
-        # Skip sheets that are clearly mapping/reference sheets
-        if 'mapping' in sheet_name.lower() or 'reference' in sheet_name.lower():
+        if is_reference_sheet(sheet_name):
             print(f"  Skipping: {sheet_name} (appears to be a reference sheet)")
-            continue
-        
-        print(f"  Fetching: {sheet_name}...")
-        data = fetch_sheet_data(spreadsheet_id, sheet_name)
+        else:
+            print(f"  Fetching: {sheet_name}...")
+            kept_names.append(sheet_name)
+    
+    if not kept_names:
+        print()
+        return {}
+    
+    # Fetch every kept sheet in one round-trip
+    try:
+        result = service.spreadsheets().values().batchGet(
+            spreadsheetId=spreadsheet_id,
+            ranges=[sheet_range(name) for name in kept_names],
+            majorDimension='ROWS',
+            fields='valueRanges(values)'
+        ).execute(num_retries=SHEETS_NUM_RETRIES)
+    except HttpError as error:
+        print(f"An error occurred: {error}")
+        return {}
+    
+    all_data = {}
+    for sheet_name, value_range in zip(kept_names, result.get('valueRanges', [])):
+        data = value_range.get('values', [])
         
         if data:
             all_data[sheet_name] = data
@@ -199,9 +428,10 @@ def load_csv_data(csv_file: str) -> List[List[str]]:
     if not os.path.exists(csv_file):
         raise FileNotFoundError(f"CSV file not found: {csv_file}")
     
-    with open(csv_file, 'r', encoding='utf-8') as f:
-        reader = csv.reader(f)
-        return list(reader)
+    # newline='' lets the C csv reader handle the multi-line strategy cells
+    # directly instead of going through universal-newline translation
+    with open(csv_file, 'r', encoding='utf-8', newline='') as f:
+        return list(csv.reader(f))
 
 
 def parse_sheet_data(sheet_data: List[List[str]], evaluator_name: str = "Unknown") -> Tuple[Dict[str, str], Dict[str, List[str]]]:
@@ -243,21 +473,19 @@ def parse_sheet_data(sheet_data: List[List[str]], evaluator_name: str = "Unknown
         if not row or len(row) <= textbook_col:
             continue
         
-        textbook_name = row[textbook_col].strip()
+        textbook_name = sys.intern(row[textbook_col].strip())
         if not textbook_name or textbook_name.startswith("MAPPING"):
             continue
         
         # Get selection (use first non-empty selection column)
         for sel_col in selection_cols:
-            if sel_col < len(row) and row[sel_col].strip():
-                selection = row[sel_col].strip()
+            if sel_col < len(row) and (selection := row[sel_col].strip()):
                 selections[textbook_name] = selection
                 break  # Take first selection found
         
         # Get comments from all comment columns
         for comment_col in comment_cols:
-            if comment_col < len(row) and row[comment_col].strip():
-                comment = row[comment_col].strip()
+            if comment_col < len(row) and (comment := row[comment_col].strip()):
                 all_comments[textbook_name].append(f"[{evaluator_name}] {comment}")
     
     return selections, dict(all_comments)
@@ -291,40 +519,27 @@ def aggregate_all_evaluators(all_sheets_data: Dict[str, List[List[str]]]) -> Tup
     return dict(all_selections), dict(all_comments)
 
 
-def categorize_comment(comment: str) -> str:
+def categorize_comment(comment: str, comment_lower: str = None) -> str:
     """
     Categorize a comment as problem, strength, or observation.
     
     Args:
         comment: The comment text
+        comment_lower: Lowercased comment text, if the caller already has it
     
     Returns:
         Category: 'problem', 'strength', or 'observation'
     """
-    comment_lower = comment.lower()
-    
-    # Problem indicators
-    problem_keywords = [
-        'missing', 'incorrect', 'wrong', 'error', 'mistake', 'failed', 'not',
-        'doesn\'t', 'don\'t', 'issue', 'problem', 'bad', 'poor', 'lacks',
-        'too short', 'too long', 'confusing', 'unclear'
-    ]
-    
-    # Strength indicators
-    strength_keywords = [
-        'good', 'better', 'best', 'great', 'excellent', 'correct', 'accurate',
-        'proper', 'well', 'perfect', 'optimal', 'happy medium'
-    ]
+    if comment_lower is None:
+        comment_lower = comment.lower()
     
     # Check for problems first (more specific)
-    for keyword in problem_keywords:
-        if keyword in comment_lower:
-            return 'problem'
+    if PROBLEM_PATTERN.search(comment_lower):
+        return 'problem'
     
     # Then check for strengths
-    for keyword in strength_keywords:
-        if keyword in comment_lower:
-            return 'strength'
+    if STRENGTH_PATTERN.search(comment_lower):
+        return 'strength'
     
     return 'observation'
 
@@ -339,9 +554,8 @@ def analyze_comments(comments_by_textbook: Dict[str, List[str]]) -> Dict:
     Returns:
         Dictionary with comment analysis
     """
-    all_comments = []
-    for textbook, comments in comments_by_textbook.items():
-        all_comments.extend(comments)
+    # Flat view over the same comment strings (no copies of the text)
+    all_comments = list(chain.from_iterable(comments_by_textbook.values()))
     
     if not all_comments:
         return {
@@ -353,13 +567,16 @@ def analyze_comments(comments_by_textbook: Dict[str, List[str]]) -> Dict:
             'all_comments': []
         }
     
+    # Lowercase each comment once for categorization and theme counting
+    comments_lower = [comment.lower() for comment in all_comments]
+    
     # Categorize comments
     problems = []
     strengths = []
     observations = []
     
-    for comment in all_comments:
-        category = categorize_comment(comment)
+    for comment, comment_lower in zip(all_comments, comments_lower):
+        category = categorize_comment(comment, comment_lower)
         if category == 'problem':
             problems.append(comment)
         elif category == 'strength':
@@ -367,36 +584,17 @@ def analyze_comments(comments_by_textbook: Dict[str, List[str]]) -> Dict:
         else:
             observations.append(comment)
     
-    # Keywords to look for in comments
-    theme_keywords = {
-        'missing_components': ['missing', 'lacks', 'doesn\'t include', 'absent', 'no keyphrase', 'no question', 'missing cri'],
-        'chunk_length': ['too short', 'too long', 'chunk', 'length', 'short chunks', 'long chunks'],
-        'formatting': ['format', 'formatting', 'layout', 'structure', 'organized'],
-        'questions_cri': ['question', 'questions', 'constructed response', 'cri', 'keyphrase', 'assessment'],
-        'chunking_strategy': ['chunking', 'chunks', 'divided', 'paragraphs', 'segmentation'],
-        'accuracy': ['accurate', 'correct', 'wrong', 'error', 'mistake', 'incorrect', 'follows'],
-        'content_issues': ['text', 'content', 'includes', 'excludes', 'page numbers', 'boxed numbers'],
-        'reference_summary': ['reference', 'summary', 'references', 'invented'],
-        'clarity': ['clear', 'clarity', 'readable', 'understandable', 'confusing', 'unclear', 'reading'],
-        'completeness': ['complete', 'incomplete', 'all', 'necessary', 'components'],
-    }
+    # Count theme mentions one theme at a time: each pass is a single
+    # compiled-regex scan over the lowered comments
+    theme_hits = {}
+    for theme, pattern in THEME_PATTERNS.items():
+        search = pattern.search
+        hits = [i for i, comment_lower in enumerate(comments_lower) if search(comment_lower)]
+        if hits:
+            theme_hits[theme] = hits
     
-    theme_counts = Counter()
-    theme_examples = defaultdict(list)
-    
-    # Count theme mentions
-    for comment in all_comments:
-        comment_lower = comment.lower()
-        for theme, keywords in theme_keywords.items():
-            for keyword in keywords:
-                if keyword in comment_lower:
-                    theme_counts[theme] += 1
-                    if len(theme_examples[theme]) < 3:
-                        theme_examples[theme].append(comment[:300])
-                    break
-    
-    # Sort themes by frequency
-    top_themes = theme_counts.most_common(10)
+    # Sort themes by frequency (ties keep the order themes were first mentioned)
+    top_themes = sorted(theme_hits.items(), key=lambda item: (-len(item[1]), item[1][0]))[:10]
     
     return {
         'total_comments': len(all_comments),
@@ -407,51 +605,56 @@ def analyze_comments(comments_by_textbook: Dict[str, List[str]]) -> Dict:
         'themes': [
             {
                 'theme': theme.replace('_', ' ').title(),
-                'count': count,
-                'percentage': (count / len(all_comments) * 100) if all_comments else 0,
-                'examples': theme_examples[theme][:2]
+                'count': len(hits),
+                'percentage': (len(hits) / len(all_comments) * 100) if all_comments else 0,
+                'examples': [all_comments[i][:300] for i in hits[:2]]
             }
-            for theme, count in top_themes
+            for theme, hits in top_themes
         ],
         'all_comments': all_comments
     }
 
 
+def index_mappings_by_textbook(mapping_data: Dict) -> Dict[str, List[str]]:
+    """
+    Index the tournament mapping by textbook name.
+    
+    Args:
+        mapping_data: The tournament mapping data
+    
+    Returns:
+        Dictionary mapping textbook name to its shuffled strategy order
+    """
+    return {item['textbook']: item['mapping'] for item in mapping_data['textbooks']}
+
+
 def map_selection_to_strategy(textbook_name: str, column_selected: str, 
-                              mapping_data: Dict) -> str:
+                              textbook_mappings: Dict[str, List[str]]) -> str:
     """
     Map the selected column (e.g., "Strategy 1") back to the actual strategy.
     
     Args:
         textbook_name: Name of the textbook
         column_selected: Which column was selected (e.g., "Strategy 1", "Strategy 2", "Strategy 3")
-        mapping_data: The tournament mapping data
+        textbook_mappings: Shuffled strategy order per textbook (see index_mappings_by_textbook)
     
     Returns:
         The actual strategy name (e.g., "strategy1", "strategy2", "strategy3")
     """
     # Find the textbook in mapping data
-    textbook_mapping = None
-    for item in mapping_data['textbooks']:
-        if item['textbook'] == textbook_name:
-            textbook_mapping = item
-            break
+    textbook_mapping = textbook_mappings.get(textbook_name)
     
     if not textbook_mapping:
         raise ValueError(f"Textbook '{textbook_name}' not found in mapping data")
     
     # Map column to index
-    column_index = {
-        'Strategy 1': 0,
-        'Strategy 2': 1,
-        'Strategy 3': 2
-    }.get(column_selected)
+    column_index = COLUMN_INDEX.get(column_selected)
     
     if column_index is None:
         raise ValueError(f"Invalid column selected: {column_selected}")
     
     # Get the actual strategy from mapping
-    actual_strategy = textbook_mapping['mapping'][column_index]
+    actual_strategy = textbook_mapping[column_index]
     
     return actual_strategy
 
@@ -467,31 +670,31 @@ def analyze_results(all_selections: Dict[str, List[str]], mapping_data: Dict) ->
     Returns:
         Dictionary with analysis results
     """
+    textbook_mappings = index_mappings_by_textbook(mapping_data)
     strategy_votes = Counter()
+    textbook_wins = Counter()
     detailed_results = []
-    votes_by_textbook = {}
     
     for textbook_name, column_selections in all_selections.items():
-        textbook_votes = Counter()
+        actual_strategies = []
         
         for column_selected in column_selections:
             try:
-                actual_strategy = map_selection_to_strategy(
-                    textbook_name, column_selected, mapping_data
-                )
-                strategy_votes[actual_strategy] += 1
-                textbook_votes[actual_strategy] += 1
+                actual_strategies.append(map_selection_to_strategy(
+                    textbook_name, column_selected, textbook_mappings
+                ))
             except ValueError as e:
                 print(f"Warning: {e}")
         
+        # Tally this textbook's votes in one Counter pass and fold them into the totals
+        textbook_votes = Counter(actual_strategies)
+        strategy_votes.update(textbook_votes)
+        
         # Determine winner for this textbook (most votes)
         if textbook_votes:
             winning_strategy = textbook_votes.most_common(1)[0][0]
-            votes_by_textbook[textbook_name] = {
-                'votes': dict(textbook_votes),
-                'winner': winning_strategy,
-                'total_votes': sum(textbook_votes.values())
-            }
+            # Count textbook wins (which strategy won the most textbooks)
+            textbook_wins[winning_strategy] += 1
             
             detailed_results.append({
                 'textbook': textbook_name,
@@ -507,11 +710,6 @@ def analyze_results(all_selections: Dict[str, List[str]], mapping_data: Dict) ->
         for strategy, count in strategy_votes.items()
     }
     
-    # Count textbook wins (which strategy won the most textbooks)
-    textbook_wins = Counter()
-    for result in detailed_results:
-        textbook_wins[result['winner']] += 1
-    
     return {
         'total_votes': dict(strategy_votes),
         'vote_percentages': strategy_percentages,
@@ -656,9 +854,28 @@ def print_results(analysis: Dict, comment_analysis: Dict = None):
         print()
 
 
+def write_json(payload: Dict, output_file: str):
+    """
+    Write a results payload as indented JSON, using orjson when available.
+    
+    Args:
+        payload: JSON-serializable data
+        output_file: Destination path
+    """
+    if orjson is not None:
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=2)
+
+
 def generate_markdown_report(analysis: Dict, comment_analysis: Dict, all_comments: Dict, output_file: str):
     """
     Generate a comprehensive markdown report of the tournament results.
+    
+    Variable-length sections are joined first and the whole document is
+    rendered from MARKDOWN_REPORT_TEMPLATE in one format call.
     """
     strategy_names = {
         'strategy1': 'Strategy 1 (Chain of Thought)',
@@ -666,117 +883,107 @@ def generate_markdown_report(analysis: Dict, comment_analysis: Dict, all_comment
         'strategy3': 'Strategy 3 (Validation)'
     }
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write("# Prompt Tournament Results\n\n")
-        f.write(f"**Date**: {os.popen('date').read().strip()}\n\n")
+    # Winner
+    sorted_by_votes = sorted(analysis['total_votes'].items(), key=lambda x: x[1], reverse=True)
+    winner_strategy, winner_votes = sorted_by_votes[0]
+    
+    # Strategy Rankings
+    rankings = []
+    for rank, (strategy, votes) in enumerate(sorted_by_votes, 1):
+        percentage = analysis['vote_percentages'][strategy]
+        full_name = strategy_names.get(strategy, strategy)
+        textbook_wins = analysis['textbook_wins'].get(strategy, 0)
         
-        # Executive Summary
-        f.write("## Executive Summary\n\n")
-        f.write(f"- **Total Evaluators**: {analysis['total_evaluators']}\n")
-        f.write(f"- **Total Textbooks**: {analysis['total_textbooks']}\n")
-        f.write(f"- **Total Votes Cast**: {analysis['total_votes_cast']}\n")
-        f.write(f"- **Total Comments**: {comment_analysis['total_comments']}\n\n")
+        medal = "🥇" if rank == 1 else "🥈" if rank == 2 else "🥉"
+        rankings.append(f"#### {medal} Rank {rank}: {full_name}\n\n")
+        rankings.append(f"- **Total Votes**: {votes} out of {analysis['total_votes_cast']} ({percentage:.1f}%)\n")
+        rankings.append(f"- **Textbooks Won**: {textbook_wins} out of {analysis['total_textbooks']}\n")
         
-        # Winner
-        sorted_by_votes = sorted(analysis['total_votes'].items(), key=lambda x: x[1], reverse=True)
-        winner_strategy, winner_votes = sorted_by_votes[0]
-        winner_percentage = analysis['vote_percentages'][winner_strategy]
+        if rank < len(sorted_by_votes):
+            next_strategy, next_votes = sorted_by_votes[rank]
+            margin = votes - next_votes
+            rankings.append(f"- **Margin over Rank {rank+1}**: +{margin} votes\n")
+        rankings.append("\n")
+    
+    # Detailed Results by Textbook
+    textbook_results = []
+    for result in analysis['detailed_results']:
+        textbook = result['textbook']
+        winner = result['winner']
+        votes = result['votes']
+        total = result['total_evaluators']
         
-        f.write(f"### 🏆 Winner: {strategy_names[winner_strategy]}\n\n")
-        f.write(f"- **{winner_votes}** votes out of {analysis['total_votes_cast']} ({winner_percentage:.1f}%)\n")
-        f.write(f"- Won **{analysis['textbook_wins'].get(winner_strategy, 0)}** out of {analysis['total_textbooks']} textbooks\n\n")
+        full_name = strategy_names.get(winner, winner)
         
-        # Strategy Rankings
-        f.write("## Strategy Rankings\n\n")
-        f.write("### By Total Votes\n\n")
+        textbook_results.append(f"### {textbook}\n\n")
+        textbook_results.append(f"**Winner**: {full_name}\n\n")
+        textbook_results.append("**Vote Breakdown**:\n\n")
         
-        for rank, (strategy, votes) in enumerate(sorted_by_votes, 1):
-            percentage = analysis['vote_percentages'][strategy]
-            full_name = strategy_names.get(strategy, strategy)
-            textbook_wins = analysis['textbook_wins'].get(strategy, 0)
-            
-            medal = "🥇" if rank == 1 else "🥈" if rank == 2 else "🥉"
-            f.write(f"#### {medal} Rank {rank}: {full_name}\n\n")
-            f.write(f"- **Total Votes**: {votes} out of {analysis['total_votes_cast']} ({percentage:.1f}%)\n")
-            f.write(f"- **Textbooks Won**: {textbook_wins} out of {analysis['total_textbooks']}\n")
-            
-            if rank < len(sorted_by_votes):
-                next_strategy, next_votes = sorted_by_votes[rank]
-                margin = votes - next_votes
-                f.write(f"- **Margin over Rank {rank+1}**: +{margin} votes\n")
-            f.write("\n")
+        for strat, vote_count in sorted(votes.items(), key=lambda x: x[1], reverse=True):
+            strat_name = strategy_names.get(strat, strat)
+            percentage = (vote_count / total * 100) if total > 0 else 0
+            textbook_results.append(f"- {strat_name}: **{vote_count}/{total}** ({percentage:.1f}%)\n")
+        textbook_results.append("\n")
+    
+    # Comment Analysis
+    comment_sections = []
+    total_comments = comment_analysis['total_comments']
+    if total_comments > 0:
+        # Comment breakdown
+        comment_sections.append("### Comment Breakdown\n\n")
+        comment_sections.append(f"- 🚨 **Problems/Issues**: {len(comment_analysis['problems'])} ({len(comment_analysis['problems'])/total_comments*100:.1f}%)\n")
+        comment_sections.append(f"- ✅ **Strengths**: {len(comment_analysis['strengths'])} ({len(comment_analysis['strengths'])/total_comments*100:.1f}%)\n")
+        comment_sections.append(f"- 📝 **Observations**: {len(comment_analysis['observations'])} ({len(comment_analysis['observations'])/total_comments*100:.1f}%)\n\n")
         
-        # Detailed Results by Textbook
-        f.write("## Detailed Results by Textbook\n\n")
+        # Problems
+        if comment_analysis['problems']:
+            comment_sections.append("### 🚨 Problems and Issues\n\n")
+            comment_sections.extend(f"{i}. {problem}\n" for i, problem in enumerate(comment_analysis['problems'], 1))
+            comment_sections.append("\n")
         
-        for result in analysis['detailed_results']:
-            textbook = result['textbook']
-            winner = result['winner']
-            votes = result['votes']
-            total = result['total_evaluators']
-            
-            full_name = strategy_names.get(winner, winner)
-            
-            f.write(f"### {textbook}\n\n")
-            f.write(f"**Winner**: {full_name}\n\n")
-            f.write("**Vote Breakdown**:\n\n")
-            
-            for strat, vote_count in sorted(votes.items(), key=lambda x: x[1], reverse=True):
-                strat_name = strategy_names.get(strat, strat)
-                percentage = (vote_count / total * 100) if total > 0 else 0
-                f.write(f"- {strat_name}: **{vote_count}/{total}** ({percentage:.1f}%)\n")
-            f.write("\n")
+        # Recurring Themes
+        if comment_analysis['themes']:
+            comment_sections.append("### 📊 Recurring Themes\n\n")
+            for i, theme_data in enumerate(comment_analysis['themes'], 1):
+                comment_sections.append(f"#### {i}. {theme_data['theme']}\n\n")
+                comment_sections.append(f"Mentioned in **{theme_data['count']}** comments ({theme_data['percentage']:.1f}%)\n\n")
+                
+                if theme_data['examples']:
+                    comment_sections.append("**Examples**:\n\n")
+                    comment_sections.extend(f"- {ex}\n" for ex in theme_data['examples'])
+                    comment_sections.append("\n")
         
-        # Comment Analysis
-        f.write("## Annotator Comments Analysis\n\n")
-        f.write(f"**Total Comments**: {comment_analysis['total_comments']}\n\n")
+        # Strengths
+        if comment_analysis['strengths']:
+            comment_sections.append("### ✅ Strengths Noted\n\n")
+            comment_sections.extend(f"{i}. {strength}\n" for i, strength in enumerate(comment_analysis['strengths'][:15], 1))
+            comment_sections.append("\n")
         
-        if comment_analysis['total_comments'] > 0:
-            # Comment breakdown
-            f.write("### Comment Breakdown\n\n")
-            f.write(f"- 🚨 **Problems/Issues**: {len(comment_analysis['problems'])} ({len(comment_analysis['problems'])/comment_analysis['total_comments']*100:.1f}%)\n")
-            f.write(f"- ✅ **Strengths**: {len(comment_analysis['strengths'])} ({len(comment_analysis['strengths'])/comment_analysis['total_comments']*100:.1f}%)\n")
-            f.write(f"- 📝 **Observations**: {len(comment_analysis['observations'])} ({len(comment_analysis['observations'])/comment_analysis['total_comments']*100:.1f}%)\n\n")
-            
-            # Problems
-            if comment_analysis['problems']:
-                f.write("### 🚨 Problems and Issues\n\n")
-                for i, problem in enumerate(comment_analysis['problems'], 1):
-                    f.write(f"{i}. {problem}\n")
-                f.write("\n")
-            
-            # Recurring Themes
-            if comment_analysis['themes']:
-                f.write("### 📊 Recurring Themes\n\n")
-                for i, theme_data in enumerate(comment_analysis['themes'], 1):
-                    theme = theme_data['theme']
-                    count = theme_data['count']
-                    percentage = theme_data['percentage']
-                    examples = theme_data['examples']
-                    
-                    f.write(f"#### {i}. {theme}\n\n")
-                    f.write(f"Mentioned in **{count}** comments ({percentage:.1f}%)\n\n")
-                    
-                    if examples:
-                        f.write("**Examples**:\n\n")
-                        for ex in examples:
-                            f.write(f"- {ex}\n")
-                        f.write("\n")
-            
-            # Strengths
-            if comment_analysis['strengths']:
-                f.write("### ✅ Strengths Noted\n\n")
-                for i, strength in enumerate(comment_analysis['strengths'][:15], 1):
-                    f.write(f"{i}. {strength}\n")
-                f.write("\n")
-            
-            # All comments by textbook
-            f.write("### All Comments by Textbook\n\n")
-            for textbook, comments in sorted(all_comments.items()):
-                f.write(f"#### {textbook}\n\n")
-                for comment in comments:
-                    f.write(f"- {comment}\n")
-                f.write("\n")
+        # All comments by textbook
+        comment_sections.append("### All Comments by Textbook\n\n")
+        for textbook, comments in sorted(all_comments.items()):
+            comment_sections.append(f"#### {textbook}\n\n")
+            comment_sections.extend(f"- {comment}\n" for comment in comments)
+            comment_sections.append("\n")
+    
+    report = MARKDOWN_REPORT_TEMPLATE.format(
+        date=datetime.now().isoformat(timespec='seconds'),
+        total_evaluators=analysis['total_evaluators'],
+        total_textbooks=analysis['total_textbooks'],
+        total_votes_cast=analysis['total_votes_cast'],
+        total_comments=total_comments,
+        winner_name=strategy_names[winner_strategy],
+        winner_votes=winner_votes,
+        winner_percentage=analysis['vote_percentages'][winner_strategy],
+        winner_textbooks=analysis['textbook_wins'].get(winner_strategy, 0),
+        rankings=''.join(rankings),
+        textbook_results=''.join(textbook_results),
+        comment_sections=''.join(comment_sections),
+    )
+    
+    # Emit the whole report with a single write
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(report)
     
     print(f"✅ Markdown report generated: {output_file}")
 
@@ -795,51 +1002,49 @@ def organize_comments_by_actual_strategy(comments_by_textbook: Dict[str, List[st
     Returns:
         Dictionary mapping actual strategy to list of comments about it
     """
-    import re
-    
-    comments_by_actual_strategy = {
-        'strategy1': [],
-        'strategy2': [],
-        'strategy3': []
-    }
-    
-    strategy_mention_pattern = re.compile(r'\b[Ss]trategy\s*([123])\b')
+    comments_by_actual_strategy = {strategy: [] for strategy in ALL_STRATEGIES}
+    textbook_mappings = index_mappings_by_textbook(mapping_data)
+    all_buckets = tuple(comments_by_actual_strategy.values())
+    find_mentions = STRATEGY_MENTION_PATTERN.finditer
     
     for textbook, comments in comments_by_textbook.items():
         # Get the mapping for this textbook
-        textbook_mapping = None
-        for item in mapping_data['textbooks']:
-            if item['textbook'] == textbook:
-                textbook_mapping = item['mapping']
-                break
+        textbook_mapping = textbook_mappings.get(textbook)
         
         if not textbook_mapping:
             continue
         
+        # Shuffled column position -> bucket, so mentions index a list
+        column_buckets = [comments_by_actual_strategy[strategy] for strategy in textbook_mapping]
+        
+        # The mapping is a permutation, so a context reaches each bucket at most
+        # once; repeated comments are dropped here instead of per bucket
+        seen_contexts = set()
+        
         for comment in comments:
-            # Find all strategy mentions in the comment
-            matches = strategy_mention_pattern.findall(comment)
+            # Comment with textbook context, as stored in every bucket
+            context = f"[{textbook}] {comment}"
+            if context in seen_contexts:
+                continue
+            seen_contexts.add(context)
             
-            if matches:
-                # Get unique strategies mentioned
-                strategies_mentioned = set(matches)
-                
+            # Find the unique strategies mentioned in the comment
+            strategies_mentioned = {match.group(1) for match in find_mentions(comment)}
+            
+            if strategies_mentioned:
+                targets = []
                 for shuffled_num in strategies_mentioned:
                     # Map shuffled column to actual strategy
                     column_index = int(shuffled_num) - 1
-                    if 0 <= column_index < len(textbook_mapping):
-                        actual_strategy = textbook_mapping[column_index]
-                        
-                        # Add comment with context
-                        context = f"[{textbook}] {comment}"
-                        if context not in comments_by_actual_strategy[actual_strategy]:
-                            comments_by_actual_strategy[actual_strategy].append(context)
+                    if 0 <= column_index < len(column_buckets):
+                        targets.append(column_buckets[column_index])
             else:
                 # Comment doesn't mention a specific strategy, add to all
-                for strategy in ['strategy1', 'strategy2', 'strategy3']:
-                    context = f"[{textbook}] {comment}"
-                    if context not in comments_by_actual_strategy[strategy]:
-                        comments_by_actual_strategy[strategy].append(context)
+                targets = all_buckets
+            
+            # Add comment with context
+            for bucket in targets:
+                bucket.append(context)
     
     return comments_by_actual_strategy
 
@@ -848,37 +1053,26 @@ def export_comments_for_llm(comment_analysis: Dict, output_file: str):
     """
     Export all comments in a format optimized for LLM analysis.
     """
+    parts = [
+        "# Prompt Tournament - Annotator Comments\n",
+        "# Format: Each comment is on a separate line\n",
+        "# Use this file for further LLM analysis\n\n",
+    ]
+    
+    sections = [
+        ("PROBLEMS AND ISSUES", comment_analysis.get('problems', [])),
+        ("STRENGTHS", comment_analysis.get('strengths', [])),
+        ("OBSERVATIONS", comment_analysis.get('observations', [])),
+        ("ALL COMMENTS (UNSORTED)", comment_analysis.get('all_comments', [])),
+    ]
+    for heading, comments in sections:
+        parts.append(SEPARATOR_LINE)
+        parts.append(f"{heading}\n")
+        parts.append(SEPARATOR_LINE + "\n")
+        parts.extend(f"{comment}\n\n" for comment in comments)
+    
     with open(output_file, 'w', encoding='utf-8') as f:
-        f.write("# Prompt Tournament - Annotator Comments\n")
-        f.write("# Format: Each comment is on a separate line\n")
-        f.write("# Use this file for further LLM analysis\n\n")
-        f.write("=" * 80 + "\n")
-        f.write("PROBLEMS AND ISSUES\n")
-        f.write("=" * 80 + "\n\n")
-        
-        for problem in comment_analysis.get('problems', []):
-            f.write(f"{problem}\n\n")
-        
-        f.write("=" * 80 + "\n")
-        f.write("STRENGTHS\n")
-        f.write("=" * 80 + "\n\n")
-        
-        for strength in comment_analysis.get('strengths', []):
-            f.write(f"{strength}\n\n")
-        
-        f.write("=" * 80 + "\n")
-        f.write("OBSERVATIONS\n")
-        f.write("=" * 80 + "\n\n")
-        
-        for obs in comment_analysis.get('observations', []):
-            f.write(f"{obs}\n\n")
-        
-        f.write("=" * 80 + "\n")
-        f.write("ALL COMMENTS (UNSORTED)\n")
-        f.write("=" * 80 + "\n\n")
-        
-        for comment in comment_analysis.get('all_comments', []):
-            f.write(f"{comment}\n\n")
+        f.write(''.join(parts))
     
     print(f"✅ Comments exported for LLM: {output_file}")
 
@@ -893,34 +1087,101 @@ def export_comments_by_strategy(comments_by_strategy: Dict[str, List[str]], outp
         'strategy3': 'Strategy 3 (Validation)'
     }
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write("# Comments Organized by Actual Strategy (Unshuffled)\n\n")
-        f.write("This file organizes all comments by the ACTUAL strategy they refer to,\n")
-        f.write("not the shuffled column names shown to evaluators.\n\n")
-        f.write("When evaluators said 'Strategy 1', 'Strategy 2', or 'Strategy 3' in their\n")
-        f.write("comments, those referred to shuffled columns. This file maps those back to\n")
-        f.write("the actual strategies.\n\n")
+    parts = [
+        "# Comments Organized by Actual Strategy (Unshuffled)\n\n",
+        "This file organizes all comments by the ACTUAL strategy they refer to,\n",
+        "not the shuffled column names shown to evaluators.\n\n",
+        "When evaluators said 'Strategy 1', 'Strategy 2', or 'Strategy 3' in their\n",
+        "comments, those referred to shuffled columns. This file maps those back to\n",
+        "the actual strategies.\n\n",
+    ]
+    
+    for strategy in ALL_STRATEGIES:
+        full_name = strategy_names[strategy]
+        comments = comments_by_strategy[strategy]
         
-        for strategy in ['strategy1', 'strategy2', 'strategy3']:
-            full_name = strategy_names[strategy]
-            comments = comments_by_strategy[strategy]
-            
-            f.write("=" * 80 + "\n")
-            f.write(f"{full_name.upper()}\n")
-            f.write("=" * 80 + "\n\n")
-            f.write(f"Total comments mentioning this strategy: {len(comments)}\n\n")
-            
-            if comments:
-                for i, comment in enumerate(comments, 1):
-                    f.write(f"{i}. {comment}\n\n")
-            else:
-                f.write("No comments found mentioning this strategy.\n\n")
-            
-            f.write("\n")
+        parts.append(SEPARATOR_LINE)
+        parts.append(f"{full_name.upper()}\n")
+        parts.append(SEPARATOR_LINE + "\n")
+        parts.append(f"Total comments mentioning this strategy: {len(comments)}\n\n")
+        
+        if comments:
+            parts.extend(f"{i}. {comment}\n\n" for i, comment in enumerate(comments, 1))
+        else:
+            parts.append("No comments found mentioning this strategy.\n\n")
+        
+        parts.append("\n")
+    
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(''.join(parts))
     
     print(f"✅ Comments by strategy exported: {output_file}")
 
 
+def _finalize_and_export(all_sheets_data: Dict[str, List[List[str]]], mapping_data: Dict,
+                         source_label: str = "sheet"):
+    """
+    Aggregate evaluator data, analyze it, and write every results file.
+    
+    Shared tail of automated_mode and csv_mode.
+    
+    Args:
+        all_sheets_data: Dictionary mapping evaluator name to sheet rows
+        mapping_data: The tournament mapping data
+        source_label: What the rows came from ("sheet" or "CSV"), used in warnings
+    """
+    # Aggregate selections and comments from all evaluators
+    all_selections, all_comments = aggregate_all_evaluators(all_sheets_data)
+    
+    if not all_selections:
+        print(f"Warning: No selections found in any {source_label}.")
+        print(f"Please check that {source_label}s have 'Selection' or 'Preferred' columns with data.")
+        return
+    
+    total_votes = sum(len(votes) for votes in all_selections.values())
+    print(f"Aggregated {total_votes} votes across {len(all_selections)} textbooks from {len(all_sheets_data)} evaluators")
+    print(f"Found {sum(len(c) for c in all_comments.values())} comments")
+    print()
+    
+    # Analyze results
+    analysis = analyze_results(all_selections, mapping_data)
+    comment_analysis = analyze_comments(all_comments)
+    
+    # Print results
+    print_results(analysis, comment_analysis)
+    
+    # Save results
+    results_file = RESULTS_JSON_FILE
+    write_json({
+        'all_selections': all_selections,
+        'analysis': analysis,
+        'comment_analysis': comment_analysis,
+        'comments_by_textbook': all_comments
+    }, results_file)
+    
+    # Generate markdown report
+    markdown_file = RESULTS_MARKDOWN_FILE
+    generate_markdown_report(analysis, comment_analysis, all_comments, markdown_file)
+    
+    # Generate separate comments file for LLM analysis
+    comments_file = COMMENTS_FILE
+    export_comments_for_llm(comment_analysis, comments_file)
+    
+    # Organize comments by actual strategy (unshuffled)
+    comments_by_strategy = organize_comments_by_actual_strategy(all_comments, mapping_data)
+    strategy_comments_file = STRATEGY_COMMENTS_FILE
+    export_comments_by_strategy(comments_by_strategy, strategy_comments_file)
+    
+    print("=" * 80)
+    print(f"📄 Results saved to:")
+    print(f"   - JSON: {results_file}")
+    print(f"   - Markdown Report: {markdown_file}")
+    print(f"   - Comments for LLM: {comments_file}")
+    print(f"   - Comments by Strategy: {strategy_comments_file}")
+    print("=" * 80)
+    print()
+
+
 def automated_mode(single_sheet: str = None):
     """
     Automated mode - fetches data directly from Google Sheets (ALL tabs).
@@ -977,57 +1238,7 @@ def automated_mode(single_sheet: str = None):
     print(f"Successfully fetched data from {len(all_sheets_data)} evaluator sheet(s)")
     print()
     
-    # Aggregate selections and comments from all evaluators
-    all_selections, all_comments = aggregate_all_evaluators(all_sheets_data)
-    
-    if not all_selections:
-        print("Warning: No selections found in any sheet.")
-        print("Please check that sheets have 'Selection' or 'Preferred' columns with data.")
-        return
-    
-    total_votes = sum(len(votes) for votes in all_selections.values())
-    print(f"Aggregated {total_votes} votes across {len(all_selections)} textbooks from {len(all_sheets_data)} evaluators")
-    print(f"Found {sum(len(c) for c in all_comments.values())} comments")
-    print()
-    
-    # Analyze results
-    analysis = analyze_results(all_selections, mapping_data)
-    comment_analysis = analyze_comments(all_comments)
-    
-    # Print results
-    print_results(analysis, comment_analysis)
-    
-    # Save results
-    results_file = os.path.join(os.path.dirname(__file__), 'tournament_results.json')
-    with open(results_file, 'w', encoding='utf-8') as f:
-        json.dump({
-            'all_selections': all_selections,
-            'analysis': analysis,
-            'comment_analysis': comment_analysis,
-            'comments_by_textbook': all_comments
-        }, f, indent=2)
-    
-    # Generate markdown report
-    markdown_file = os.path.join(os.path.dirname(__file__), 'tournament_results.md')
-    generate_markdown_report(analysis, comment_analysis, all_comments, markdown_file)
-    
-    # Generate separate comments file for LLM analysis
-    comments_file = os.path.join(os.path.dirname(__file__), 'tournament_comments.txt')
-    export_comments_for_llm(comment_analysis, comments_file)
-    
-    # Organize comments by actual strategy (unshuffled)
-    comments_by_strategy = organize_comments_by_actual_strategy(all_comments, mapping_data)
-    strategy_comments_file = os.path.join(os.path.dirname(__file__), 'comments_by_strategy.txt')
-    export_comments_by_strategy(comments_by_strategy, strategy_comments_file)
-    
-    print("=" * 80)
-    print(f"📄 Results saved to:")
-    print(f"   - JSON: {results_file}")
-    print(f"   - Markdown Report: {markdown_file}")
-    print(f"   - Comments for LLM: {comments_file}")
-    print(f"   - Comments by Strategy: {strategy_comments_file}")
-    print("=" * 80)
-    print()
+    _finalize_and_export(all_sheets_data, mapping_data, source_label="sheet")
 
 
 def interactive_mode():
@@ -1060,14 +1271,16 @@ def interactive_mode():
     for item in mapping_data['textbooks']:
         textbook_name = item['textbook']
         
+        prompt = f"{textbook_name} - Selected column (1/2/3/skip): "
+        
         while True:
-            response = input(f"{textbook_name} - Selected column (1/2/3/skip): ").strip().lower()
+            response = input(prompt).strip().lower()
             
             if response == 'skip':
                 break
             elif response == 'done':
                 break
-            elif response in ['1', '2', '3']:
+            elif response in VALID_COLUMN_RESPONSES:
                 column_name = f"Strategy {response}"
                 selections[textbook_name] = column_name
                 break
@@ -1090,12 +1303,11 @@ def interactive_mode():
     print_results(analysis)
     
     # Save results
-    results_file = os.path.join(os.path.dirname(__file__), 'tournament_results.json')
-    with open(results_file, 'w', encoding='utf-8') as f:
-        json.dump({
-            'selections': selections,
-            'analysis': analysis
-        }, f, indent=2)
+    results_file = RESULTS_JSON_FILE
+    write_json({
+        'selections': selections,
+        'analysis': analysis
+    }, results_file)
     
     print(f"Results saved to: {results_file}")
     print()
@@ -1123,22 +1335,25 @@ def csv_mode(csv_files: List[str]):
     print(f"Loaded mapping for {len(mapping_data['textbooks'])} textbooks")
     print()
     
-    # Load all CSV files
+    # Load all CSV files concurrently; results are collected in argument order
     all_sheets_data = {}
     
-    for csv_file in csv_files:
-        print(f"Loading data from CSV: {csv_file}")
-        try:
-            sheet_data = load_csv_data(csv_file)
-            evaluator_name = os.path.basename(csv_file).replace('.csv', '')
-            all_sheets_data[evaluator_name] = sheet_data
-            print(f"  ✓ Loaded {len(sheet_data)} rows")
-        except FileNotFoundError as e:
-            print(f"  ✗ Error: {e}")
-            continue
-        except Exception as e:
-            print(f"  ✗ Error reading CSV: {e}")
-            continue
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(csv_files)))) as executor:
+        futures = [(csv_file, executor.submit(load_csv_data, csv_file)) for csv_file in csv_files]
+        
+        for csv_file, future in futures:
+            print(f"Loading data from CSV: {csv_file}")
+            try:
+                sheet_data = future.result()
+                evaluator_name = os.path.basename(csv_file).replace('.csv', '')
+                all_sheets_data[evaluator_name] = sheet_data
+                print(f"  ✓ Loaded {len(sheet_data)} rows")
+            except FileNotFoundError as e:
+                print(f"  ✗ Error: {e}")
+                continue
+            except Exception as e:
+                print(f"  ✗ Error reading CSV: {e}")
+                continue
     
     if not all_sheets_data:
         print("Error: Could not load any CSV files.")
@@ -1148,57 +1363,7 @@ def csv_mode(csv_files: List[str]):
     print(f"Successfully loaded data from {len(all_sheets_data)} CSV file(s)")
     print()
     
-    # Aggregate selections and comments from all evaluators
-    all_selections, all_comments = aggregate_all_evaluators(all_sheets_data)
-    
-    if not all_selections:
-        print("Warning: No selections found in any CSV.")
-        print("Please check that CSVs have 'Selection' or 'Preferred' columns with data.")
-        return
-    
-    total_votes = sum(len(votes) for votes in all_selections.values())
-    print(f"Aggregated {total_votes} votes across {len(all_selections)} textbooks from {len(all_sheets_data)} evaluators")
-    print(f"Found {sum(len(c) for c in all_comments.values())} comments")
-    print()
-    
-    # Analyze results
-    analysis = analyze_results(all_selections, mapping_data)
-    comment_analysis = analyze_comments(all_comments)
-    
-    # Print results
-    print_results(analysis, comment_analysis)
-    
-    # Save results
-    results_file = os.path.join(os.path.dirname(__file__), 'tournament_results.json')
-    with open(results_file, 'w', encoding='utf-8') as f:
-        json.dump({
-            'all_selections': all_selections,
-            'analysis': analysis,
-            'comment_analysis': comment_analysis,
-            'comments_by_textbook': all_comments
-        }, f, indent=2)
-    
-    # Generate markdown report
-    markdown_file = os.path.join(os.path.dirname(__file__), 'tournament_results.md')
-    generate_markdown_report(analysis, comment_analysis, all_comments, markdown_file)
-    
-    # Generate separate comments file for LLM analysis
-    comments_file = os.path.join(os.path.dirname(__file__), 'tournament_comments.txt')
-    export_comments_for_llm(comment_analysis, comments_file)
-    
-    # Organize comments by actual strategy (unshuffled)
-    comments_by_strategy = organize_comments_by_actual_strategy(all_comments, mapping_data)
-    strategy_comments_file = os.path.join(os.path.dirname(__file__), 'comments_by_strategy.txt')
-    export_comments_by_strategy(comments_by_strategy, strategy_comments_file)
-    
-    print("=" * 80)
-    print(f"📄 Results saved to:")
-    print(f"   - JSON: {results_file}")
-    print(f"   - Markdown Report: {markdown_file}")
-    print(f"   - Comments for LLM: {comments_file}")
-    print(f"   - Comments by Strategy: {strategy_comments_file}")
-    print("=" * 80)
-    print()
+    _finalize_and_export(all_sheets_data, mapping_data, source_label="CSV")
 
 
 def main():
@@ -1211,44 +1376,22 @@ def main():
         python analyze_tournament_results.py --csv file1.csv file2.csv ...  # Load from CSV files
         python analyze_tournament_results.py --interactive      # Manual input mode
     """
-    import sys
-    
-    # Check for command line arguments
-    if '--interactive' in sys.argv:
+    parser = argparse.ArgumentParser(description="Analyze prompt tournament results.")
+    parser.add_argument('--interactive', action='store_true',
+                        help="Manually enter the selected column for each textbook")
+    parser.add_argument('--csv', nargs='+', metavar='CSV_FILE',
+                        help="Load evaluator sheets from CSV files instead of Google Sheets")
+    parser.add_argument('--sheet', default=None,
+                        help="Only read this sheet tab (default: all tabs)")
+    args = parser.parse_args()
+    
+    if args.interactive:
         interactive_mode()
-    elif '--csv' in sys.argv:
-        # CSV mode - collect all CSV files
-        try:
-            csv_idx = sys.argv.index('--csv')
-            # Collect all arguments after --csv that don't start with --
-            csv_files = []
-            for i in range(csv_idx + 1, len(sys.argv)):
-                if sys.argv[i].startswith('--'):
-                    break
-                csv_files.append(sys.argv[i])
-            
-            if not csv_files:
-                print("Error: --csv requires at least one file path")
-                print("Usage: python analyze_tournament_results.py --csv file1.csv [file2.csv ...]")
-            else:
-                csv_mode(csv_files)
-        except (ValueError, IndexError):
-            print("Error: --csv requires at least one file path")
-            print("Usage: python analyze_tournament_results.py --csv file1.csv [file2.csv ...]")
+    elif args.csv:
+        csv_mode(args.csv)
     else:
-        # Default to automated mode (ALL sheets)
-        single_sheet = None
-        
-        # Check if user wants only a specific sheet
-        if '--sheet' in sys.argv:
-            try:
-                sheet_idx = sys.argv.index('--sheet')
-                if sheet_idx + 1 < len(sys.argv):
-                    single_sheet = sys.argv[sheet_idx + 1]
-            except (ValueError, IndexError):
-                pass
-        
-        automated_mode(single_sheet)
+        # Default to automated mode (ALL sheets unless --sheet is given)
+        automated_mode(args.sheet)
 
 
 if __name__ == '__main__':
@@ -7,6 +7,7 @@ Shuffles strategy outputs for blind evaluation and exports to Google Sheets.
 import json
 import random
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Tuple
 from google.oauth2.credentials import Credentials
@@ -16,7 +17,14 @@ from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 import pickle
 
-# If modifying these scopes, delete the file token.pickle.
+from token_store import save_token
+
+try:
+    import orjson
+except ImportError:  # optional; falls back to the stdlib parser/encoder
+    orjson = None
+
+# If modifying these scopes, delete the file token.json.
 SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
 
 # Directory containing the revised outputs
@@ -30,18 +38,36 @@ STRATEGY_FILES = {
 }
 
 
+# Sheets service is built once per process and reused
+_SERVICE = None
+
+
 def authenticate_google_sheets():
     """
     Authenticate with Google Sheets API using OAuth2 (personal account).
+    
+    The service is cached for the lifetime of the process; its authorized
+    transport refreshes the access token on its own once it expires.
     """
+    global _SERVICE
+    
+    if _SERVICE is not None:
+        return _SERVICE
+    
     creds = None
     
-    # The file token.pickle stores the user's access and refresh tokens
-    token_path = os.path.join(os.path.dirname(__file__), 'token.pickle')
+    # The file token.json stores the user's access and refresh tokens
+    token_path = os.path.join(os.path.dirname(__file__), 'token.json')
+    legacy_token_path = os.path.join(os.path.dirname(__file__), 'token.pickle')
     
     if os.path.exists(token_path):
-        with open(token_path, 'rb') as token:
+        # Keep the scopes stored in the token; analyze_tournament_results.py shares this file
+        creds = Credentials.from_authorized_user_file(token_path)
+    elif os.path.exists(legacy_token_path):
+        # One-time migration from the old pickled token; saved as JSON below
+        with open(legacy_token_path, 'rb') as token:
             creds = pickle.load(token)
+        save_token(creds, token_path)
     
     # If there are no (valid) credentials available, let the user log in
     if not creds or not creds.valid:
@@ -65,10 +91,10 @@ def authenticate_google_sheets():
             creds = flow.run_local_server(port=0)
         
         # Save the credentials for the next run
-        with open(token_path, 'wb') as token:
-            pickle.dump(creds, token)
+        save_token(creds, token_path)
     
-    return build('sheets', 'v4', credentials=creds)
+    _SERVICE = build('sheets', 'v4', credentials=creds)
+    return _SERVICE
 
 
 def load_strategy_outputs(textbook_folder: str) -> Dict[str, dict]:
@@ -83,12 +109,21 @@ def load_strategy_outputs(textbook_folder: str) -> Dict[str, dict]:
     """
     outputs = {}
     
+    # One directory read replaces an exists() stat per strategy file; exists()
+    # still covers names spelled differently on case-insensitive filesystems
+    with os.scandir(textbook_folder) as entries:
+        present = {entry.name for entry in entries}
+    
     for strategy_name, filename in STRATEGY_FILES.items():
         filepath = os.path.join(textbook_folder, filename)
         
-        if os.path.exists(filepath):
-            with open(filepath, 'r', encoding='utf-8') as f:
-                outputs[strategy_name] = json.load(f)
+        if filename in present or os.path.exists(filepath):
+            if orjson is not None:
+                with open(filepath, 'rb') as f:
+                    outputs[strategy_name] = orjson.loads(f.read())
+            else:
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    outputs[strategy_name] = json.load(f)
         else:
             print(f"Warning: {filepath} not found")
             outputs[strategy_name] = None
@@ -131,23 +166,49 @@ def format_json_for_display(data: dict, max_chars: int = 49000) -> str:
     if not data:
         return "N/A"
     
+    # Stop formatting once the text is past the limit; the rest would be cut anyway
     output = []
+    length = -1  # no newline before the first line
+    for line in iter_display_lines(data):
+        output.append(line)
+        length += len(line) + 1
+        if length > max_chars:
+            break
+    
+    result = "\n".join(output)
+    
+    # Truncate if too long
+    if len(result) > max_chars:
+        result = result[:max_chars] + "\n\n... [TRUNCATED - Content exceeds character limit]"
     
+    return result
+
+
+def iter_display_lines(data: dict):
+    """
+    Yield the markdown lines of a strategy output, in display order.
+    
+    Args:
+        data: Parsed JSON data from strategy output
+    
+    Yields:
+        One line of the formatted markdown at a time
+    """
     # Volume level
-    output.append("# Volume")
-    output.append(f"Title: {data.get('Title', 'N/A')}")
-    output.append(f"Description: {data.get('Description', 'N/A')}")
-    output.append(f"VolumeSummary: {data.get('VolumeSummary', 'N/A')}")
-    output.append("")
+    yield "# Volume"
+    yield f"Title: {data.get('Title', 'N/A')}"
+    yield f"Description: {data.get('Description', 'N/A')}"
+    yield f"VolumeSummary: {data.get('VolumeSummary', 'N/A')}"
+    yield ""
     
     # Pages
     pages = data.get('Pages', [])
     for page in pages:
-        output.append("# Page")
-        output.append(f"Title: {page.get('Title', 'N/A')}")
-        output.append(f"Order: {page.get('Order', 'N/A')}")
-        output.append(f"ReferenceSummary: {page.get('ReferenceSummary', 'N/A')}")
-        output.append("")
+        yield "# Page"
+        yield f"Title: {page.get('Title', 'N/A')}"
+        yield f"Order: {page.get('Order', 'N/A')}"
+        yield f"ReferenceSummary: {page.get('ReferenceSummary', 'N/A')}"
+        yield ""
         
         # Content chunks
         content = page.get('Content', [])
@@ -155,24 +216,16 @@ def format_json_for_display(data: dict, max_chars: int = 49000) -> str:
             component = chunk.get('__component', '')
             
             if 'plain-chunk' in component:
-                output.append("## Plain Chunk")
+                yield "## Plain Chunk"
             else:
-                output.append("## Normal Chunk")
+                yield "## Normal Chunk"
             
             # Add ALL chunk fields (except __component which we already used)
             for key, value in chunk.items():
                 if key != '__component':  # Skip internal component field
-                    output.append(f"{key}: {value}")
+                    yield f"{key}: {value}"
             
-            output.append("")
-    
-    result = "\n".join(output)
-    
-    # Truncate if too long
-    if len(result) > max_chars:
-        result = result[:max_chars] + "\n\n... [TRUNCATED - Content exceeds character limit]"
-    
-    return result
+            yield ""
 
 
 def validate_cell_sizes(values: List[List[str]]) -> bool:
@@ -193,6 +246,40 @@ def validate_cell_sizes(values: List[List[str]]) -> bool:
     return True
 
 
+def build_update_cells_request(values: List[List[str]], sheet_id: int = 0) -> Dict:
+    """
+    Build an updateCells request that writes a 2D array of text starting at A1.
+    
+    Every cell is sent as a stringValue, so model output that looks like a
+    number or starts with '=' is shown verbatim instead of being parsed.
+    
+    Args:
+        values: 2D array of cell values
+        sheet_id: ID of the sheet to write into
+    
+    Returns:
+        Request dict for spreadsheets().batchUpdate
+    """
+    rows = [
+        {'values': [
+            {'userEnteredValue': {'stringValue': cell}} if cell else {}
+            for cell in row
+        ]}
+        for row in values
+    ]
+    return {
+        'updateCells': {
+            'start': {
+                'sheetId': sheet_id,
+                'rowIndex': 0,
+                'columnIndex': 0
+            },
+            'rows': rows,
+            'fields': 'userEnteredValue'
+        }
+    }
+
+
 def create_combined_spreadsheet(service, all_textbook_data: List[Dict]) -> str:
     """
     Create a single Google Spreadsheet with all textbooks.
@@ -267,22 +354,11 @@ def create_combined_spreadsheet(service, all_textbook_data: List[Dict]) -> str:
             print("This should not happen with the 49,000 char split limit.")
             return None
         
-        body = {
-            'values': values
-        }
-        
-        # Update the sheet with data
-        service.spreadsheets().values().update(
-            spreadsheetId=spreadsheet_id,
-            range='Evaluation!A1',
-            valueInputOption='USER_ENTERED',
-            body=body
-        ).execute()
-        
-        # Format the sheet
+        # Write the data and format the sheet in a single batchUpdate round-trip
         num_textbooks = len(all_textbook_data)
         
         requests = [
+            build_update_cells_request(values),
             # Format header row
             {
                 'repeatCell': {
@@ -407,12 +483,12 @@ def main():
         return
     
     # Get all textbook folders
-    textbook_folders = [
-        d for d in os.listdir(REVISED_OUTPUTS_DIR)
-        if os.path.isdir(os.path.join(REVISED_OUTPUTS_DIR, d)) and not d.startswith('.')
-    ]
-    
-    textbook_folders.sort()
+    # scandir entries carry the file type, so no extra stat per folder
+    with os.scandir(REVISED_OUTPUTS_DIR) as entries:
+        textbook_folders = sorted(
+            entry.name for entry in entries
+            if not entry.name.startswith('.') and entry.is_dir()
+        )
     
     print(f"Found {len(textbook_folders)} textbook folders:")
     for folder in textbook_folders:
@@ -422,15 +498,15 @@ def main():
     # Process each textbook and collect data
     all_textbook_data = []
     
-    for textbook_name in textbook_folders:
+    # Read the strategy files of all textbooks concurrently; map() keeps folder order
+    textbook_paths = [os.path.join(REVISED_OUTPUTS_DIR, name) for name in textbook_folders]
+    with ThreadPoolExecutor(max_workers=max(1, min(16, len(textbook_paths)))) as executor:
+        loaded_strategies = list(executor.map(load_strategy_outputs, textbook_paths))
+    
+    for textbook_name, strategies in zip(textbook_folders, loaded_strategies):
         print(f"Processing: {textbook_name}")
         print("-" * 80)
         
-        textbook_path = os.path.join(REVISED_OUTPUTS_DIR, textbook_name)
-        
-        # Load strategy outputs
-        strategies = load_strategy_outputs(textbook_path)
-        
         # Check if all strategies are loaded
         if None in strategies.values():
             print(f"⚠ Warning: Some strategies missing for {textbook_name}")
@@ -487,8 +563,12 @@ def main():
             } for item in all_textbook_data]
         }
         
-        with open(mapping_file, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2)
+        if orjson is not None:
+            with open(mapping_file, 'wb') as f:
+                f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+        else:
+            with open(mapping_file, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
         
         print(f"Mapping saved to: {mapping_file}")
         print()
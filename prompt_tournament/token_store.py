@@ -0,0 +1,33 @@
+"""
+OAuth token persistence shared by the prompt tournament scripts.
+"""
+
+import os
+import tempfile
+
+
+def save_token(creds, token_path: str):
+    """
+    Persist OAuth credentials as authorized-user JSON.
+    
+    The JSON is written to a temporary file next to ``token_path`` and then
+    moved over it, so an interrupted write never leaves a truncated token.
+    
+    Args:
+        creds: Google OAuth2 credentials
+        token_path: Path of the JSON token file
+    """
+    token_dir = os.path.dirname(os.path.abspath(token_path))
+    fd, tmp_path = tempfile.mkstemp(dir=token_dir, prefix='.token-', suffix='.json.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as token:
+            token.write(creds.to_json())
+            token.flush()
+            os.fsync(token.fileno())
+        os.replace(tmp_path, token_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
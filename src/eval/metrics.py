@@ -1,9 +1,16 @@
 import argparse
+import os
 import json
 import csv
 import re
 import html
 import unicodedata
+import math
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from functools import lru_cache
+from itertools import chain, repeat
 from typing import Dict, Any, List, Tuple, Optional
 
 try:
@@ -15,9 +22,25 @@ except Exception as e:
     print(f"Failed to load BLEURT: {e}")
     BLEURT_AVAILABLE = False
 
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except Exception:
+    NUMPY_AVAILABLE = False
+
+try:
+    import numba
+
+    NUMBA_AVAILABLE = NUMPY_AVAILABLE
+except Exception:
+    NUMBA_AVAILABLE = False
+
 try:
     from bs4 import BeautifulSoup
     from rapidfuzz import process, fuzz
+    from rapidfuzz.distance import LCSseq as _RFLCSseq
+    from rapidfuzz.distance import Levenshtein as _RFLev
 
     FUZZY_AVAILABLE = True
     print("rapidfuzz loaded successfully!")
@@ -25,15 +48,38 @@ except Exception as e:
     print(f"Failed to load rapidfuzz: {e}")
     FUZZY_AVAILABLE = False
 
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except Exception:
+    ORJSON_AVAILABLE = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+
+    SELECTOLAX_AVAILABLE = True
+except Exception:
+    SELECTOLAX_AVAILABLE = False
+
 TAG_RE = re.compile(r"<[^>]+>")
 WS_RE = re.compile(r"\s+")
+SPACE_TAB_RE = re.compile(r"[ \t]+")
+NEWLINE_WS_RE = re.compile(r"\s*\n\s*")
+MULTI_WS_RE = re.compile(r"\s{2,}")
 
 
 def load_json(path: str) -> Optional[Dict[str, Any]]:
     """Load JSON file, return None if there's a syntax error"""
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(path, "rb") as f:
+            raw = f.read()
+        if ORJSON_AVAILABLE:
+            try:
+                return orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                pass  # json also accepts NaN and big ints, let it decide and report
+        return json.loads(raw.decode("utf-8"))
     except json.JSONDecodeError as e:
         print(f"WARNING: JSON syntax error in {path}: {e}")
         print(f"  -> Skipping this file, values will be blank in output")
@@ -90,6 +136,7 @@ def validate_json_structure(data: Optional[Dict[str, Any]]) -> Tuple[bool, str]:
     return True, f"Valid ({len(pages)} page(s))"
 
 
+@lru_cache(maxsize=1024)
 def clean_text(s: str) -> str:
     """
     Clean text while preserving HTML tags.
@@ -103,14 +150,96 @@ def clean_text(s: str) -> str:
     return s
 
 
-def levenshtein_distance(a: str, b: str) -> int:
+def levenshtein_distance(a: str, b: str, score_cutoff: Optional[int] = None) -> int:
+    """
+    Edit distance between two strings.
+    With score_cutoff, any distance above it is reported as score_cutoff + 1.
+    """
+    if FUZZY_AVAILABLE:
+        return _RFLev.distance(a, b, score_cutoff=score_cutoff)
+
     if a == b:
         return 0
     if not a:
-        return len(b)
-    if not b:
-        return len(a)
+        dist = len(b)
+    elif not b:
+        dist = len(a)
+    elif NUMBA_AVAILABLE:
+        dist = int(
+            _levenshtein_codes(
+                np.frombuffer(a.encode("utf-32-le"), dtype=np.uint32),
+                np.frombuffer(b.encode("utf-32-le"), dtype=np.uint32),
+            )
+        )
+    elif NUMPY_AVAILABLE:
+        dist = _levenshtein_distance_np(a, b)
+    else:
+        dist = _levenshtein_distance_py(a, b)
+    if score_cutoff is not None and dist > score_cutoff:
+        return score_cutoff + 1
+    return dist
+
 
+def levenshtein_distances(refs: List[str], hyps: List[str]) -> List[int]:
+    """Pairwise edit distance of refs[i] against hyps[i], batched when rapidfuzz is available"""
+    if FUZZY_AVAILABLE and NUMPY_AVAILABLE and hasattr(process, "cpdist"):
+        # cpdist scores element-wise pairs in C++ across all cores
+        return process.cpdist(refs, hyps, scorer=_RFLev.distance, workers=-1).tolist()
+    return [levenshtein_distance(ref, hyp) for ref, hyp in zip(refs, hyps)]
+
+
+if NUMBA_AVAILABLE:
+
+    @numba.njit(cache=True)
+    def _levenshtein_codes(a, b):
+        # Wagner-Fischer over code points with two int32 rows swapped per step
+        if a.shape[0] > b.shape[0]:
+            a, b = b, a
+        la = a.shape[0]
+        previous_row = np.arange(la + 1).astype(np.int32)
+        current_row = np.empty(la + 1, dtype=np.int32)
+        for j in range(b.shape[0]):
+            bj = b[j]
+            current_row[0] = j + 1
+            for i in range(1, la + 1):
+                best = previous_row[i - 1] if a[i - 1] == bj else previous_row[i - 1] + 1
+                if previous_row[i] + 1 < best:
+                    best = previous_row[i] + 1
+                if current_row[i - 1] + 1 < best:
+                    best = current_row[i - 1] + 1
+                current_row[i] = best
+            previous_row, current_row = current_row, previous_row
+        return previous_row[la]
+
+
+def _levenshtein_distance_np(a: str, b: str) -> int:
+    """Wagner-Fischer with each DP row computed by NumPy instead of a Python inner loop"""
+    # Ensure a is the shorter string so rows stay small
+    if len(a) > len(b):
+        a, b = b, a
+
+    a_codes = np.frombuffer(a.encode("utf-32-le"), dtype=np.uint32)
+    b_codes = np.frombuffer(b.encode("utf-32-le"), dtype=np.uint32).tolist()
+    offsets = np.arange(len(a) + 1, dtype=np.int32)
+    previous_row = offsets.copy()
+    current_row = np.empty_like(previous_row)
+    for j, bj in enumerate(b_codes, start=1):
+        # Deletions and substitutions only depend on the previous row
+        current_row[0] = j
+        np.minimum(
+            previous_row[1:] + 1,
+            previous_row[:-1] + (a_codes != bj),
+            out=current_row[1:],
+        )
+        # Insertions chain left to right: row[i] = min over k <= i of row[k] + (i - k)
+        current_row -= offsets
+        np.minimum.accumulate(current_row, out=current_row)
+        current_row += offsets
+        previous_row, current_row = current_row, previous_row
+    return int(previous_row[-1])
+
+
+def _levenshtein_distance_py(a: str, b: str) -> int:
     # Ensure a is the shorter string to reduce memory
     if len(a) > len(b):
         a, b = b, a
@@ -129,27 +258,24 @@ def levenshtein_distance(a: str, b: str) -> int:
     return previous_row[-1]
 
 
+@lru_cache(maxsize=1024)
 def strip_html(text: str) -> str:
     text = html.unescape(text)
     # Remove HTML tags
-    text = re.sub(r"<[^>]+>", " ", text)
-    # Normalize Unicode (e.g., fancy quotes)
-    text = unicodedata.normalize("NFKC", text)
+    text = TAG_RE.sub(" ", text)
+    # Normalize Unicode (e.g., fancy quotes); ASCII text is already NFKC
+    if not text.isascii():
+        text = unicodedata.normalize("NFKC", text)
     # Collapse whitespace
-    text = re.sub(r"\s+", " ", text).strip()
+    text = WS_RE.sub(" ", text).strip()
     return text
 
 
 def preprocess_page_levenshtein(
     title: str, content_items: List[Dict[str, Any]], lowercase: bool = True
 ) -> str:
-    parts: List[str] = [title or ""]
-    for item in content_items or []:
-        text = item.get("Text", "")
-        if not isinstance(text, str):
-            continue
-        parts.append(text)
-    combined = "\n".join(parts)
+    texts = (item.get("Text", "") for item in content_items or [])
+    combined = "\n".join(chain((title or "",), (text for text in texts if isinstance(text, str))))
     cleaned = strip_html(combined)
     if lowercase:
         cleaned = cleaned.lower()
@@ -185,15 +311,74 @@ def build_pages_map_levenshtein(
     return pages
 
 
-def rouge_l_f_score(ref: str, hyp: str) -> float:
-    def _tokenize(text: str) -> List[str]:
-        if not text:
-            return []
-        return WS_RE.split(text.strip())
+def _tokenize(text: str) -> List[str]:
+    if not text:
+        return []
+    return WS_RE.split(text.strip())
+
+
+def _ngram_counts(tokens: List[str], n: int) -> Counter:
+    if n <= 0 or len(tokens) < n:
+        return Counter()
+    # zip over shifted views builds every n-gram tuple in C
+    return Counter(zip(*(tokens[i:] for i in range(n))))
 
+
+def reference_ngram_counts(tokens: List[str], max_n: int = 4) -> Dict[int, Counter]:
+    """N-gram counts of a reference for n = 1..max_n, reusable across hypotheses"""
+    return {n: _ngram_counts(tokens, n) for n in range(1, max_n + 1)}
+
+
+if NUMBA_AVAILABLE:
+
+    @numba.njit(cache=True)
+    def _lcs_length_ids(a, b):
+        # One DP row reused in place; diag carries the previous row's value at j - 1
+        lb = b.shape[0]
+        row = np.zeros(lb + 1, dtype=np.int32)
+        for i in range(a.shape[0]):
+            ai = a[i]
+            diag = 0
+            for j in range(1, lb + 1):
+                up = row[j]
+                if ai == b[j - 1]:
+                    row[j] = diag + 1
+                elif row[j - 1] > up:
+                    row[j] = row[j - 1]
+                diag = up
+        return row[lb]
+
+
+def _lcs_length_np(a_ids: "np.ndarray", b_ids: "np.ndarray") -> int:
+    """LCS length with each DP row computed by NumPy instead of a Python inner loop"""
+    # Iterate over the shorter sequence so the Python loop stays short
+    if a_ids.shape[0] > b_ids.shape[0]:
+        a_ids, b_ids = b_ids, a_ids
+    row = np.zeros(b_ids.shape[0] + 1, dtype=np.int32)
+    best = np.empty(b_ids.shape[0], dtype=np.int32)
+    for ai in a_ids.tolist():
+        # Match/skip candidates only depend on the previous row
+        np.maximum(row[1:], row[:-1] + (b_ids == ai), out=best)
+        # Skipping a hyp token carries the running maximum left to right
+        np.maximum.accumulate(best, out=row[1:])
+    return int(row[-1])
+
+
+def rouge_l_f_score(ref: str, hyp: str, ref_tokens: Optional[List[str]] = None) -> float:
     def _lcs_length(a: List[str], b: List[str]) -> int:
         if not a or not b:
             return 0
+        if FUZZY_AVAILABLE:
+            # Bit-parallel (Hyyro) LCS over hashed tokens, 64 DP cells per machine word
+            return _RFLCSseq.similarity(a, b)
+        if NUMPY_AVAILABLE:
+            # Map tokens to integer ids so they can be compared as arrays
+            vocab: Dict[str, int] = {}
+            a_ids = np.fromiter((vocab.setdefault(t, len(vocab)) for t in a), dtype=np.int32, count=len(a))
+            b_ids = np.fromiter((vocab.setdefault(t, len(vocab)) for t in b), dtype=np.int32, count=len(b))
+            if NUMBA_AVAILABLE:
+                return int(_lcs_length_ids(a_ids, b_ids))
+            return _lcs_length_np(a_ids, b_ids)
         la, lb = len(a), len(b)
         if la < lb:
             a, b = b, a
@@ -210,7 +395,10 @@ def rouge_l_f_score(ref: str, hyp: str) -> float:
             prev = cur
         return prev[-1]
 
-    ref_toks = _tokenize(ref)
+    ref_toks = _tokenize(ref) if ref_tokens is None else ref_tokens
+    if ref_toks and hyp == ref:
+        # Identical pages: LCS covers every token
+        return 1.0
     hyp_toks = _tokenize(hyp)
     if not ref_toks or not hyp_toks:
         return 0.0
@@ -223,38 +411,35 @@ def rouge_l_f_score(ref: str, hyp: str) -> float:
     return (1 + beta2) * prec * rec / (rec + beta2 * prec)
 
 
-def bleu_sentence(ref: str, hyp: str, max_n: int = 4) -> float:
-    def _tokenize(text: str) -> List[str]:
-        if not text:
-            return []
-        return WS_RE.split(text.strip())
-
-    def _ngram_counts(tokens: List[str], n: int) -> Dict[Tuple[str, ...], int]:
-        counts: Dict[Tuple[str, ...], int] = {}
-        if n <= 0 or len(tokens) < n:
-            return counts
-        for i in range(len(tokens) - n + 1):
-            ngram = tuple(tokens[i : i + n])
-            counts[ngram] = counts.get(ngram, 0) + 1
-        return counts
-
-    ref_tokens = _tokenize(ref)
+def bleu_sentence(
+    ref: str,
+    hyp: str,
+    max_n: int = 4,
+    ref_tokens: Optional[List[str]] = None,
+    ref_ngrams: Optional[Dict[int, Counter]] = None,
+) -> float:
+    """Sentence BLEU; pass ref_tokens/ref_ngrams to reuse one reference across hypotheses"""
+    ref_tokens = _tokenize(ref) if ref_tokens is None else ref_tokens
+    if len(ref_tokens) >= max_n and hyp == ref:
+        # Identical pages: every n-gram precision and the brevity penalty are 1
+        return 1.0
     hyp_tokens = _tokenize(hyp)
     if not ref_tokens or not hyp_tokens:
         return 0.0
 
     precisions: List[float] = []
     for n in range(1, max_n + 1):
-        ref_counts = _ngram_counts(ref_tokens, n)
+        if ref_ngrams is not None and n in ref_ngrams:
+            ref_counts = ref_ngrams[n]
+        else:
+            ref_counts = _ngram_counts(ref_tokens, n)
         hyp_counts = _ngram_counts(hyp_tokens, n)
         if not hyp_counts:
             precisions.append(0.0)
             continue
-        match = 0
-        total = 0
-        for ng, c in hyp_counts.items():
-            total += c
-            match += min(c, ref_counts.get(ng, 0))
+        # Counter & keeps the clipped (min) count of every shared n-gram
+        match = sum((hyp_counts & ref_counts).values())
+        total = len(hyp_tokens) - n + 1
         epsilon = 1e-9
         precisions.append((match + epsilon) / (total + epsilon))
 
@@ -278,21 +463,29 @@ def bleu_sentence(ref: str, hyp: str, max_n: int = 4) -> float:
 # Chapter-level BLEU functions removed - now using page-level comparison for all references
 
 
-def bleurt_preprocess_piece(title: str, text: str, lowercase: bool = False) -> str:
-    def strip_html_bs4(s: str) -> str:
-        if not FUZZY_AVAILABLE:
-            return clean_text(s or "")
-        s = html.unescape(s or "")
-        return BeautifulSoup(s, "lxml").get_text(separator=" ")
-
-    def normalize_ws_punct(s: str) -> str:
-        s = unicodedata.normalize("NFKC", s)
-        s = re.sub(r"[ \t]+", " ", s)
-        s = re.sub(r"\s*\n\s*", "\n", s)
-        s = re.sub(r"\s{2,}", " ", s)
-        return s.strip()
+def normalize_ws_punct(s: str) -> str:
+    s = unicodedata.normalize("NFKC", s)
+    s = SPACE_TAB_RE.sub(" ", s)
+    s = NEWLINE_WS_RE.sub("\n", s)
+    s = MULTI_WS_RE.sub(" ", s)
+    return s.strip()
 
-    t = f"{title}\n\n{text}" if title else (text or "")
+
+def strip_html_bs4(s: str) -> str:
+    if SELECTOLAX_AVAILABLE:
+        tree = LexborHTMLParser(html.unescape(s or ""))
+        # Match BeautifulSoup's get_text(), which leaves out script/style contents
+        tree.strip_tags(["script", "style"])
+        return tree.text(separator=" ")
+    if not FUZZY_AVAILABLE:
+        return clean_text(s or "")
+    s = html.unescape(s or "")
+    return BeautifulSoup(s, "lxml").get_text(separator=" ")
+
+
+@lru_cache(maxsize=1024)
+def _bleurt_clean(t: str, lowercase: bool) -> str:
+    """Strip/normalize a combined page string (cached, model files repeat pages)"""
     t = strip_html_bs4(t)
     t = normalize_ws_punct(t)
     if lowercase:
@@ -300,34 +493,106 @@ def bleurt_preprocess_piece(title: str, text: str, lowercase: bool = False) -> s
     return t
 
 
-def title_key(s: str) -> str:
-    """Normalize title for matching"""
+def bleurt_preprocess_piece(title: str, text: str, lowercase: bool = False) -> str:
+    t = f"{title}\n\n{text}" if title else (text or "")
+    return _bleurt_clean(str(t), bool(lowercase))
 
-    def normalize_ws_punct(s: str) -> str:
-        s = unicodedata.normalize("NFKC", s)
-        s = re.sub(r"[ \t]+", " ", s)
-        s = re.sub(r"\s*\n\s*", "\n", s)
-        s = re.sub(r"\s{2,}", " ", s)
-        return s.strip()
 
+@lru_cache(maxsize=None)
+def title_key(s: str) -> str:
+    """Normalize title for matching (cached, the same titles recur across models)"""
+    if s.isascii() and s.isprintable():
+        # Only plain spaces can occur and NFKC is a no-op, so one split/join
+        # gives the same result as the regex passes in normalize_ws_punct
+        return " ".join(s.split()).lower()
     return normalize_ws_punct(s).lower()
 
 
+def best_title_matches(queries: List[str], choices: List[str]) -> List[Optional[Tuple[str, float]]]:
+    """
+    Best WRatio match among choices for every query, scored as one matrix.
+    Returns (choice, score) per query, or None when there are no choices.
+    """
+    if not queries:
+        return []
+    if not choices:
+        return [None] * len(queries)
+    if not NUMPY_AVAILABLE:
+        return [process.extractOne(q, choices, scorer=fuzz.WRatio, processor=None)[:2] for q in queries]
+    scores = process.cdist(
+        queries, choices, scorer=fuzz.WRatio, processor=None, workers=-1, dtype=np.float64
+    )
+    best_idx = scores.argmax(axis=1)
+    best_scores = scores[np.arange(len(queries)), best_idx]
+    return [(choices[i], float(score)) for i, score in zip(best_idx.tolist(), best_scores.tolist())]
+
+
 def align_by_title_fuzzy(keys_ref: List[str], keys_other: List[str], threshold: int = 45) -> Dict[str, str]:
     """Fuzzy title alignment with configurable threshold"""
     mapping: Dict[str, str] = {}
     ref_set = set(keys_ref)
+    unmatched = []
     for k in keys_other:
         if k in ref_set:
             mapping[k] = k
-        elif FUZZY_AVAILABLE:
-            best = process.extractOne(k, list(ref_set), scorer=fuzz.WRatio)
+        else:
+            unmatched.append(k)
+    if unmatched and FUZZY_AVAILABLE:
+        choices = list(dict.fromkeys(keys_ref))
+        for k, best in zip(unmatched, best_title_matches(unmatched, choices)):
             # Use configurable threshold (default 45 for better matching)
             if best and best[1] >= threshold:
                 mapping[k] = best[0]
     return mapping
 
 
+def write_scores_csv(path: str, fieldnames: List[str], new_rows: List[Dict[str, Any]]) -> None:
+    """
+    Stream new score rows into the master CSV.
+    Existing rows with the same (Reference JSON, Content, Model) are replaced,
+    all others are copied through unchanged.
+    """
+    key_cols = ("Reference JSON", "Content", "Model")
+    new_keys = {
+        tuple("" if row[col] is None else str(row[col]) for col in key_cols) for row in new_rows
+    }
+    tmp_path = f"{path}.tmp"
+    with ExitStack() as stack:
+        reader = None
+        if os.path.exists(path):
+            reader = csv.DictReader(stack.enter_context(open(path, newline="", encoding="utf-8")))
+        existing_fields = list(reader.fieldnames or []) if reader else []
+        out_fields = existing_fields + [f for f in fieldnames if f not in existing_fields]
+
+        out_f = stack.enter_context(open(tmp_path, "w", newline="", encoding="utf-8"))
+        writer = csv.DictWriter(out_f, fieldnames=out_fields, extrasaction="ignore", lineterminator="\n")
+        writer.writeheader()
+        if reader:
+            for row in reader:
+                if tuple(row.get(col) for col in key_cols) not in new_keys:
+                    writer.writerow(row)
+        writer.writerows(new_rows)
+    os.replace(tmp_path, path)
+
+
+def score_model_pages(
+    ref_pages: List[Tuple[str, List[str], Optional[Dict[int, Counter]]]],
+    hyp_texts: List[str],
+    use_rouge: bool,
+    use_bleu: bool,
+) -> Dict[str, List[float]]:
+    """ROUGE-L/BLEU of one model's pages against (ref, ref_tokens, ref_ngrams) reference pages"""
+    scores: Dict[str, List[float]] = {"rouge": [], "bleu": []}
+    for (ref, ref_tokens, ref_ngrams), hyp in zip(ref_pages, hyp_texts):
+        if use_rouge:
+            scores["rouge"].append(rouge_l_f_score(ref, hyp, ref_tokens=ref_tokens))
+        if use_bleu:
+            scores["bleu"].append(
+                bleu_sentence(ref, hyp, ref_tokens=ref_tokens, ref_ngrams=ref_ngrams)
+            )
+    return scores
+
+
 def main() -> None:
     ap = argparse.ArgumentParser()
     ap.add_argument("--original", required=True, help="Original/reference JSON file")
@@ -347,8 +612,6 @@ def main() -> None:
     args = ap.parse_args()
 
     # Extract source name from original file path
-    import os
-
     source_name = os.path.splitext(os.path.basename(args.original))[0]
 
     # Load original data
@@ -407,7 +670,58 @@ def main() -> None:
     use_bleu = not args.no_bleu
     use_bleurt = not args.no_bleurt and BLEURT_AVAILABLE
 
-    # BLEURT setup
+    orders_sorted = sorted(orig_pages.keys())
+
+    # Page texts of each model, aligned to the reference page order
+    ref_texts = [orig_pages[order][1] for order in orders_sorted]
+    hyp_texts_by_model = [
+        [model_pages.get(order, ("", ""))[1] for order in orders_sorted]
+        for model_pages in models_pages
+    ]
+    valid_model_idx = [i for i, model_info in enumerate(models_info) if model_info["valid"]]
+
+    # Levenshtein for all pages of a model in one batched call
+    lev_by_model: Dict[int, List[int]] = {
+        i: levenshtein_distances(ref_texts, hyp_texts_by_model[i]) for i in valid_model_idx
+    }
+
+    # ROUGE/BLEU are pure-Python DPs, so independent models are scored in parallel processes
+    text_scores_by_model: Dict[int, Dict[str, List[float]]] = {}
+    if (use_rouge or use_bleu) and valid_model_idx:
+        ref_pages = []
+        for ref in ref_texts:
+            ref_tokens = _tokenize(ref)
+            ref_ngrams = reference_ngram_counts(ref_tokens) if use_bleu else None
+            ref_pages.append((ref, ref_tokens, ref_ngrams))
+        hyp_lists = [hyp_texts_by_model[i] for i in valid_model_idx]
+        score_args = (repeat(ref_pages), hyp_lists, repeat(use_rouge), repeat(use_bleu))
+        if len(valid_model_idx) > 1:
+            max_workers = min(len(valid_model_idx), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(score_model_pages, *score_args))
+        else:
+            results = list(map(score_model_pages, *score_args))
+        text_scores_by_model = dict(zip(valid_model_idx, results))
+
+    # Scores are stored column-wise: one flat page-major list per metric, NaN when missing.
+    # Model i's column is the strided slice [i::n_models], so no numpy is needed here.
+    n_pages, n_models = len(orders_sorted), len(models_info)
+    n_rows = n_pages * n_models
+    page_index = {order: i for i, order in enumerate(orders_sorted)}
+    score_arrays = {
+        metric: [math.nan] * n_rows
+        for metric in ("levenshtein", "rouge", "bleu", "bleurt")
+    }
+    bleurt_matched = [None] * n_rows
+    for model_idx, lev in lev_by_model.items():
+        score_arrays["levenshtein"][model_idx::n_models] = lev
+    for model_idx, text_scores in text_scores_by_model.items():
+        if use_rouge:
+            score_arrays["rouge"][model_idx::n_models] = text_scores["rouge"]
+        if use_bleu:
+            score_arrays["bleu"][model_idx::n_models] = text_scores["bleu"]
+
+    # BLEURT setup (after the scoring pool so workers never fork a loaded model)
     bleurt_metric = None
     if use_bleurt:
         try:
@@ -417,50 +731,6 @@ def main() -> None:
             print(f"Failed to load BLEURT metric: {e}")
             use_bleurt = False
 
-    orders_sorted = sorted(orig_pages.keys())
-
-    # Collect all scores in a nested structure: {order: {metric: {model_name: score}}}
-    all_scores: Dict[int, Dict[str, Any]] = {}
-
-    for order in orders_sorted:
-        title, ref = orig_pages.get(order, ("", ""))
-
-        all_scores[order] = {"title": title}
-
-        # Initialize metric dictionaries for all models
-        all_scores[order]["levenshtein"] = {}
-        if use_rouge:
-            all_scores[order]["rouge"] = {}
-        if use_bleu:
-            all_scores[order]["bleu"] = {}
-        all_scores[order]["bleurt"] = {}
-        all_scores[order]["bleurt_matched"] = {}
-
-        # Compute scores for each model
-        for model_idx, model_info in enumerate(models_info):
-            model_name = model_info["name"]
-            model_valid = model_info["valid"]
-            model_pages = models_pages[model_idx]
-
-            _t_model, hyp_model = model_pages.get(order, (title, ""))
-
-            # Levenshtein
-            lev = levenshtein_distance(ref, hyp_model) if model_valid else None
-            all_scores[order]["levenshtein"][model_name] = lev
-
-            # ROUGE
-            if use_rouge:
-                rouge = rouge_l_f_score(ref, hyp_model or "") if model_valid else None
-                all_scores[order]["rouge"][model_name] = rouge
-
-            # BLEU - page-level comparison for all references
-            if use_bleu:
-                bleu = bleu_sentence(ref, hyp_model) if model_valid else None
-                all_scores[order]["bleu"][model_name] = bleu
-
-            # BLEURT (will be filled in later)
-            all_scores[order]["bleurt"][model_name] = None
-
     # Determine which metrics to include
     metrics = ["levenshtein"]
     if use_rouge:
@@ -472,69 +742,6 @@ def main() -> None:
     # Add validation and metadata columns
     fieldnames = ["Reference JSON", "Content", "Model", "json_valid"] + metrics + ["bleurt_matched"]
 
-    # Load existing CSV if it exists for append/update mode
-    import pandas as pd
-
-    existing_df = None
-    if os.path.exists(args.out):
-        try:
-            existing_df = pd.read_csv(args.out)
-            # print(f"Loaded existing CSV with {len(existing_df)} rows")
-        except Exception as e:
-            # print(f"Could not load existing CSV: {e}")
-            existing_df = None
-
-    # Collect new rows to add/update
-    new_rows = []
-    for order in orders_sorted:
-        title = all_scores[order]["title"]
-
-        # Write row for each model
-        for model_info in models_info:
-            model_name = model_info["name"]
-            row = {
-                "Reference JSON": source_name,
-                "Content": title,
-                "Model": model_name,
-                "json_valid": model_info["structure_valid"]
-            }
-            for metric in metrics:
-                if metric in all_scores[order]:
-                    row[metric] = all_scores[order][metric].get(model_name)
-                else:
-                    row[metric] = None
-            # Initialize bleurt_matched as None (will be updated during BLEURT computation)
-            row["bleurt_matched"] = None
-            new_rows.append(row)
-
-    # Create new dataframe from new rows
-    new_df = pd.DataFrame(new_rows, columns=fieldnames)
-
-    # Merge with existing data if present
-    if existing_df is not None:
-        # Remove duplicates based on (Reference JSON, Content, Model) tuple - keep old data for non-matching rows
-        # First, identify rows in existing_df that should be replaced
-        mask = existing_df.apply(
-            lambda row: any(
-                row["Reference JSON"] == new_row["Reference JSON"]
-                and row["Content"] == new_row["Content"]
-                and row["Model"] == new_row["Model"]
-                for new_row in new_rows
-            ),
-            axis=1,
-        )
-        # Keep rows that don't match any new rows
-        kept_df = existing_df[~mask]
-        # Combine kept rows with new rows
-        final_df = pd.concat([kept_df, new_df], ignore_index=True)
-        # print(f"Updated {mask.sum()} existing rows, kept {len(kept_df)} unchanged rows, added {len(new_df)} new/updated rows")
-    else:
-        final_df = new_df
-        # print(f"Created new CSV with {len(final_df)} rows")
-
-    # Write to CSV
-    final_df.to_csv(args.out, index=False)
-
     if use_bleurt and bleurt_metric is not None:
         print("Computing BLEURT scores...")
 
@@ -554,7 +761,10 @@ def main() -> None:
                     "Unrecognized JSON shape. Expected list or dict with 'data' or 'pages'."
                 )
 
-            out = []
+            return pages
+
+        def iter_page_records(pages):
+            """Yield (title, text, order) per page, in a single pass"""
             for idx, p in enumerate(pages):
                 if not isinstance(p, dict):
                     continue
@@ -570,27 +780,22 @@ def main() -> None:
                                 if t:
                                     parts.append(t if isinstance(t, str) else str(t))
                         text = " ".join(parts)
-                out.append({"Title": title, "Text": text, "Order": p.get("Order", idx)})
-            return out
+                yield title, text, p.get("Order", idx)
 
         def to_page_map(struct):
             result = {}
             if struct is None:
                 return result
             try:
-                pages_list = extract_pages(struct)
+                pages = extract_pages(struct)
             except ValueError:
                 # Invalid structure - return empty result
                 return result
-            for rec in pages_list:
-                pre = bleurt_preprocess_piece(
-                    rec["Title"], rec["Text"], lowercase=False
-                )
-                key = title_key(rec["Title"])
-                result[key] = {
-                    "Title": rec["Title"],
-                    "Text": pre,
-                    "Order": rec["Order"],
+            for title, text, order in iter_page_records(pages):
+                result[title_key(title)] = {
+                    "Title": title,
+                    "Text": bleurt_preprocess_piece(title, text, lowercase=False),
+                    "Order": order,
                 }
             return result
 
@@ -598,11 +803,17 @@ def main() -> None:
             mapping = {}
             unmatched = []
             ref_set = set(keys_ref)
+            to_match = [k for k in keys_other if k not in ref_set]
+            best_matches = (
+                dict(zip(to_match, best_title_matches(to_match, keys_ref)))
+                if FUZZY_AVAILABLE
+                else {}
+            )
             for k in keys_other:
                 if k in ref_set:
                     mapping[k] = k
                 elif FUZZY_AVAILABLE:
-                    best = process.extractOne(k, list(ref_set), scorer=fuzz.WRatio)
+                    best = best_matches[k]
                     # Lower threshold to 45 for better matching
                     if best and best[1] >= 45:
                         mapping[k] = best[0]
@@ -646,67 +857,89 @@ def main() -> None:
             )
             models_mappings.append(mapping)
 
-        # Compute BLEURT for each page and each model
-        for okey, o in m_orig.items():
-            order = o["Order"]
-            orig_text = o["Text"]
-
-            # Process each model
-            for model_idx, model_info in enumerate(models_info):
-                model_name = model_info["name"]
-                model_valid = model_info["valid"]
-                model_page_map = models_page_maps[model_idx]
-                model_mapping = models_mappings[model_idx]
-
-                model_text = None
-                matched = False
-                model_keys_for_this = [k for k, v in model_mapping.items() if v == okey]
-                if model_keys_for_this:
-                    model_text = model_page_map[model_keys_for_this[0]]["Text"]
-                    matched = True
-
-                # Compute BLEURT score - only if source data is valid and page matched
-                model_score = None
-                if model_valid and model_text:
-                    try:
-                        res = bleurt_metric.compute(
-                            predictions=[model_text], references=[orig_text]
-                        )
-                        model_score = res["scores"][0]
-                    except Exception:
-                        pass
-
-                # Update the all_scores dictionary
-                all_scores[order]["bleurt"][model_name] = model_score
-                all_scores[order]["bleurt_matched"][model_name] = matched
+        # BLEURT runs in batches instead of one forward pass per page
+        bleurt_batch_size = max(1, int(os.environ.get("BLEURT_BATCH_SIZE", "64")))
+
+        def compute_bleurt(predictions, references):
+            scores = []
+            for start in range(0, len(predictions), bleurt_batch_size):
+                preds = predictions[start : start + bleurt_batch_size]
+                refs = references[start : start + bleurt_batch_size]
+                try:
+                    res = bleurt_metric.compute(predictions=preds, references=refs)
+                    scores.extend(res["scores"])
+                except Exception:
+                    # Retry pair by pair so one bad page only blanks its own score
+                    for pred, ref in zip(preds, refs):
+                        try:
+                            res = bleurt_metric.compute(predictions=[pred], references=[ref])
+                            scores.append(res["scores"][0])
+                        except Exception:
+                            scores.append(None)
+            return scores
+
+        # Collect matched (prediction, reference) pairs for every model first
+        ref_to_model_keys = []
+        pending = []
+        for model_idx, model_info in enumerate(models_info):
+            model_page_map = models_page_maps[model_idx]
+
+            # First model page aligned to each reference page
+            ref_to_model_key = {}
+            for model_key, ref_key in models_mappings[model_idx].items():
+                ref_to_model_key.setdefault(ref_key, model_key)
+            ref_to_model_keys.append(ref_to_model_key)
+
+            # Score only pages where source data is valid and a page matched
+            if model_info["valid"]:
+                for okey, o in m_orig.items():
+                    model_key = ref_to_model_key.get(okey)
+                    if model_key is None:
+                        continue
+                    model_text = model_page_map[model_key]["Text"]
+                    if model_text:
+                        pending.append((model_idx, okey, (model_text, o["Text"])))
+
+        # Each distinct pair goes through BLEURT once, in full batches across models
+        unique_pairs = list(dict.fromkeys(pair for _, _, pair in pending))
+        pair_scores = dict(
+            zip(
+                unique_pairs,
+                compute_bleurt([pred for pred, _ in unique_pairs], [ref for _, ref in unique_pairs]),
+            )
+        )
+        bleurt_by_key = {(model_idx, okey): pair_scores[pair] for model_idx, okey, pair in pending}
+
+        # Scatter results into the score arrays
+        for model_idx, ref_to_model_key in enumerate(ref_to_model_keys):
+            for okey, o in m_orig.items():
+                page_idx = page_index[o["Order"]]
+                score = bleurt_by_key.get((model_idx, okey))
+                row_idx = page_idx * n_models + model_idx
+                score_arrays["bleurt"][row_idx] = math.nan if score is None else score
+                bleurt_matched[row_idx] = okey in ref_to_model_key
 
         print(
-            f"  Computed BLEURT for {len(all_scores)} pages across {len(models_info)} models"
+            f"  Computed BLEURT for {n_pages} pages across {len(models_info)} models"
         )
 
-        # Rewrite the CSV with updated BLEURT scores
-        df = pd.read_csv(args.out)
-        print(f"  CSV has {len(df)} rows")
-
-        # Update BLEURT column in the dataframe
-        for idx, row in df.iterrows():
-            ref_json = row["Reference JSON"]
-            content = row["Content"]
-            model = row["Model"]
-
-            # Only update rows that match current source
-            if ref_json == source_name:
-                # Find the order for this content
-                for order in orders_sorted:
-                    if all_scores[order]["title"] == content:
-                        if model in all_scores[order]["bleurt"]:
-                            df.at[idx, "bleurt"] = all_scores[order]["bleurt"][model]
-                        if model in all_scores[order]["bleurt_matched"]:
-                            df.at[idx, "bleurt_matched"] = all_scores[order]["bleurt_matched"][model]
-                        break
-
-        df.to_csv(args.out, index=False)
-        print(f"  Updated CSV with BLEURT scores")
+    # Rows are page-major, one per model, matching the score lists
+    columns = {
+        "Reference JSON": [source_name] * n_rows,
+        "Content": [orig_pages[order][0] for order in orders_sorted for _ in range(n_models)],
+        "Model": [model_info["name"] for model_info in models_info] * n_pages,
+        "json_valid": [model_info["structure_valid"] for model_info in models_info] * n_pages,
+        "bleurt_matched": bleurt_matched,
+    }
+    for metric in metrics:
+        values = score_arrays[metric]
+        if metric == "levenshtein":
+            columns[metric] = [None if v != v else int(v) for v in values]
+        else:
+            columns[metric] = [None if v != v else v for v in values]
+    new_rows = [dict(zip(fieldnames, row)) for row in zip(*(columns[f] for f in fieldnames))]
+
+    write_scores_csv(args.out, fieldnames, new_rows)
 
     print(f"Wrote aggregated scores → {args.out}")
 
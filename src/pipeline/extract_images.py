@@ -1,11 +1,11 @@
-import io
-import json
 import os
-from typing import Any, Optional
+import re
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Any, Iterator, Optional
 
 import fitz
-from PIL import Image
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 
 class BBox(BaseModel):
@@ -40,6 +40,10 @@ class ImageMetadata(BaseModel):
     nearby_text: NearbyText
 
 
+# Serializes the whole metadata list in one pydantic-core call
+_METADATA_ADAPTER = TypeAdapter(list[ImageMetadata])
+
+
 class ExtractImages:
     """Utility to extract images and nearby metadata from a PDF.
 
@@ -47,18 +51,35 @@ class ExtractImages:
         pdf_path: Path to the PDF file.
         output_dir: Directory where extracted images and metadata are saved.
         metadata: List of metadata dictionaries for each extracted image.
+        max_workers: Upper bound on worker processes used by `extract_img`.
+        _seen: Maps an image xref to the (filepath, filename, pixels) of its
+            first extraction, so images repeated across pages are written once.
     """
 
-    def __init__(self, pdf_path: str, output_dir: str) -> None:
+    # Below this many pages per worker, process startup outweighs the speedup
+    MIN_PAGES_PER_WORKER = 8
+
+    # Common caption indicators, matched in one case-insensitive scan
+    _CAPTION_RE = re.compile(r"figure|fig\.|image|photo|source:|credit:", re.IGNORECASE)
+
+    def __init__(
+        self, pdf_path: str, output_dir: str, max_workers: int = 1
+    ) -> None:
         """Initialize the extractor.
 
         Args:
             pdf_path: Path to the input PDF file.
             output_dir: Directory to write extracted images and metadata.
+            max_workers: Maximum number of worker processes for extraction.
+                Defaults to 1 (sequential, no process pool). Larger values
+                need the caller's entry point behind ``if __name__ == "__main__"``
+                on platforms that spawn worker processes.
         """
         self.pdf_path: str = pdf_path
         self.output_dir: str = output_dir
+        self.max_workers: int = max(1, max_workers)
         self.metadata: list[ImageMetadata] = []
+        self._seen: dict[int, tuple[str, str, str]] = {}
         os.makedirs(self.output_dir, exist_ok=True)
 
     def describe_position(
@@ -104,6 +125,7 @@ class ExtractImages:
         page: fitz.Page,
         img_bbox: tuple[float, float, float, float],
         distance: int = 50,
+        page_blocks: Optional[list[tuple]] = None,
     ) -> NearbyText:
         """Find nearby text blocks around an image bbox.
 
@@ -111,6 +133,11 @@ class ExtractImages:
             page: A `fitz.Page` instance to search for text blocks.
             img_bbox: Tuple (x0, y0, x1, y1) for the image bounding box.
             distance: Padding distance (in page units) around the image to search.
+            page_blocks: Optional result of `page.get_text("blocks")` for the
+                whole page, shared across the page's images. Blocks that fall
+                fully inside the search area are taken from it directly, so
+                the page is only re-parsed with a clip when a block straddles
+                the area and has to be trimmed.
 
         Returns:
             NearbyText: A Pydantic model with attributes 'above', 'below', 'left', and 'right', each mapping to a list of strings containing nearby text blocks.
@@ -122,7 +149,21 @@ class ExtractImages:
             x1 + distance,
             y1 + distance,
         )
-        text_blocks = page.get_text("blocks", clip=search_bbox)
+        text_blocks = None
+        if page_blocks is not None:
+            sx0, sy0, sx1, sy1 = search_bbox
+            text_blocks = []
+            for block in page_blocks:
+                bx0, by0, bx1, by1 = block[:4]
+                if bx1 < sx0 or bx0 > sx1 or by1 < sy0 or by0 > sy1:
+                    continue
+                if bx0 < sx0 or by0 < sy0 or bx1 > sx1 or by1 > sy1:
+                    # Only a clipped extraction trims a straddling block correctly
+                    text_blocks = None
+                    break
+                text_blocks.append(block)
+        if text_blocks is None:
+            text_blocks = page.get_text("blocks", clip=search_bbox)
 
         nearby_text = NearbyText()
 
@@ -163,85 +204,167 @@ class ExtractImages:
             if texts:
                 text = texts[0]
                 if len(text) < 200 and (
-                    any(
-                        indicator in text.lower()
-                        for indicator in [
-                            "figure",
-                            "fig.",
-                            "image",
-                            "photo",
-                            "source:",
-                            "credit:",
-                        ]
-                    )
+                    self._CAPTION_RE.search(text) is not None
                     or len(text.split()) < 30
                 ):
                     return text
         return None
 
+    def _extract_page(
+        self, doc: fitz.Document, page_num: int
+    ) -> tuple[int, list[tuple[int, ImageMetadata]]]:
+        """Extract the images on one page, writing files and building metadata.
+
+        Images already extracted from an earlier page (same xref, e.g. logos)
+        are not decoded or written again; their metadata reuses the first file.
+
+        Args:
+            doc: The open `fitz.Document` the page belongs to.
+            page_num: Zero-based page index.
+
+        Returns:
+            The number of images found on the page and `(xref, ImageMetadata)`
+            pairs for those whose bbox could be resolved.
+        """
+        page_metadata: list[tuple[int, ImageMetadata]] = []
+        page = doc[page_num]
+        image_list = page.get_images(full=True)
+        if not image_list:
+            # Text-only pages need no geometry or text extraction
+            return 0, page_metadata
+
+        # page.rect builds a new Rect on every access; read it once per page
+        page_rect = page.rect
+        page_width, page_height = page_rect.width, page_rect.height
+        # Text blocks are parsed once per page and shared by its images
+        page_blocks = page.get_text("blocks")
+
+        for image_index, img in enumerate(image_list, start=1):
+            xref = img[0]
+            if xref not in self._seen:
+                base_image = doc.extract_image(xref)
+                filename = f"page_{page_num + 1}_img_{image_index}.{base_image['ext']}"
+                filepath = os.path.join(self.output_dir, filename)
+
+                with open(filepath, "wb") as f:
+                    f.write(base_image["image"])
+
+                # extract_image already reports the pixel size, no need to decode
+                pixels = f"{base_image['width']}x{base_image['height']}"
+                self._seen[xref] = (filepath, filename, pixels)
+            filepath, filename, pixels = self._seen[xref]
+
+            bbox = page.get_image_bbox(img)
+            if not isinstance(bbox, fitz.Rect):
+                print("  Warning: Could not get bbox for image, skipping metadata.")
+                continue
+            x0, y0, x1, y1 = bbox.x0, bbox.y0, bbox.x1, bbox.y1
+
+            nearby_text = self.get_nearby_text(
+                page, (x0, y0, x1, y1), distance=50, page_blocks=page_blocks
+            )
+            width_pct = ((x1 - x0) / page_width) * 100
+            height_pct = ((y1 - y0) / page_height) * 100
+
+            metadata = ImageMetadata(
+                filepath=filepath,
+                filename=filename,
+                page_num=page_num + 1,
+                image_id=f"image_page_{page_num + 1}_{image_index}",
+                position=self.describe_position(bbox, page_width, page_height),
+                bbox=BBox(x0=x0, y0=y0, x1=x1, y1=y1),
+                size=Size(
+                    width_pct=f"{width_pct:.1f}%",
+                    height_pct=f"{height_pct:.1f}%",
+                    pixels=pixels,
+                ),
+                caption=self.find_caption(nearby_text),
+                nearby_text=nearby_text,
+            )
+            page_metadata.append((xref, metadata))
+
+        return len(image_list), page_metadata
+
     def extract_img(self) -> list[dict[str, Any]]:
         """Extract images from the PDF and collect metadata.
 
         Scans each page for images, writes image files to `output_dir`, and
-        gathers metadata including position, size and nearby text.
+        gathers metadata including position, size and nearby text. Larger
+        PDFs are split into contiguous page ranges handled by a process pool,
+        each worker opening its own document.
 
         Returns:
             A list of `ImageMetadata` instances for each extracted image.
         """
+        self.metadata.extend(self.iter_metadata())
+        return _METADATA_ADAPTER.dump_python(self.metadata)
+
+    def iter_metadata(self) -> Iterator[ImageMetadata]:
+        """Extract images from the PDF, yielding metadata in page order.
+
+        Does the same work as `extract_img` without collecting the records on
+        `metadata`, so large PDFs can be streamed (see `save_metadata_stream`)
+        without holding every record in memory. Only the `_seen` xref map is
+        kept on the instance; it is reset at the start of each pass, so
+        calling this again re-extracts every image.
+
+        Yields:
+            An `ImageMetadata` instance for each extracted image.
+        """
         if not os.path.exists(self.pdf_path):
             raise FileNotFoundError(f"PDF File not found: {self.pdf_path}")
 
+        self._seen = {}
         with fitz.open(self.pdf_path) as doc:
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                image_list = page.get_images(full=True)
-
-                print(f"Page {page_num + 1}: {len(image_list)} image(s)")
-
-                for image_index, img in enumerate(image_list, start=1):
-                    base_image = doc.extract_image(img[0])
-                    filename = (
-                        f"page_{page_num + 1}_img_{image_index}.{base_image['ext']}"
-                    )
-                    filepath = os.path.join(self.output_dir, filename)
-
-                    with open(filepath, "wb") as f:
-                        f.write(base_image["image"])
-
-                    bbox = page.get_image_bbox(img)
-                    if not isinstance(bbox, fitz.Rect):
-                        print(
-                            "  Warning: Could not get bbox for image, skipping metadata."
-                        )
-                        continue
-                    x0, y0, x1, y1 = bbox.x0, bbox.y0, bbox.x1, bbox.y1
-                    image = Image.open(io.BytesIO(base_image["image"]))
-
-                    nearby_text = self.get_nearby_text(page, (x0, y0, x1, y1), distance=50)
-                    width_pct = ((x1 - x0) / page.rect.width) * 100
-                    height_pct = ((y1 - y0) / page.rect.height) * 100
-
-                    self.metadata.append(
-                        ImageMetadata(
-                            filepath=filepath,
-                            filename=filename,
-                            page_num=page_num + 1,
-                            image_id=f"image_page_{page_num + 1}_{image_index}",
-                            position=self.describe_position(
-                                bbox, page.rect.width, page.rect.height
-                            ),
-                            bbox=BBox(x0=x0, y0=y0, x1=x1, y1=y1),
-                            size=Size(
-                                width_pct=f"{width_pct:.1f}%",
-                                height_pct=f"{height_pct:.1f}%",
-                                pixels=f"{image.width}x{image.height}",
-                            ),
-                            caption=self.find_caption(nearby_text),
-                            nearby_text=nearby_text,
-                        )
-                    )
-
-        return [m.model_dump() for m in self.metadata]
+            page_count = len(doc)
+            workers = min(
+                self.max_workers, -(-page_count // self.MIN_PAGES_PER_WORKER)
+            )
+            if workers <= 1:
+                for page_num in range(page_count):
+                    image_count, page_metadata = self._extract_page(doc, page_num)
+                    yield from self._finish_page(page_num, image_count, page_metadata)
+                return
+
+        bounds = [page_count * i // workers for i in range(workers + 1)]
+        chunks = [range(lo, hi) for lo, hi in zip(bounds, bounds[1:])]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # map() yields in submission order, so metadata stays in page order
+            for chunk, chunk_results in zip(
+                chunks,
+                pool.map(
+                    _extract_page_range,
+                    repeat(self.pdf_path),
+                    repeat(self.output_dir),
+                    chunks,
+                ),
+            ):
+                for page_num, (image_count, page_metadata) in zip(chunk, chunk_results):
+                    yield from self._finish_page(page_num, image_count, page_metadata)
+
+    def _finish_page(
+        self,
+        page_num: int,
+        image_count: int,
+        page_metadata: list[tuple[int, ImageMetadata]],
+    ) -> Iterator[ImageMetadata]:
+        """Report a processed page and yield its metadata, in page order.
+
+        Workers only see their own page range, so an image repeated across
+        ranges is extracted once per worker; later copies are removed here
+        and pointed at the first file.
+        """
+        print(f"Page {page_num + 1}: {image_count} image(s)")
+        for xref, meta in page_metadata:
+            first = self._seen.setdefault(
+                xref, (meta.filepath, meta.filename, meta.size.pixels)
+            )
+            if first[0] != meta.filepath:
+                # Repeats within the same worker share a copy already removed
+                if os.path.exists(meta.filepath):
+                    os.remove(meta.filepath)
+                meta.filepath, meta.filename = first[0], first[1]
+            yield meta
 
     def save_metadata(self, output_path: str) -> None:
         """Write the collected metadata to a JSON file.
@@ -249,5 +372,38 @@ class ExtractImages:
         Args:
             output_path: File path where JSON metadata will be written.
         """
+        with open(output_path, "wb") as f:
+            f.write(_METADATA_ADAPTER.dump_json(self.metadata, indent=2))
+
+    def save_metadata_stream(self, output_path: str) -> int:
+        """Extract images and write their metadata as JSON Lines while extracting.
+
+        Records are written as they are produced instead of being collected
+        first, which keeps memory flat on large, image-heavy PDFs.
+
+        Args:
+            output_path: File path where JSON Lines metadata will be written.
+
+        Returns:
+            The number of metadata records written.
+        """
+        count = 0
         with open(output_path, "w", encoding="utf-8") as f:
-            json.dump([m.model_dump() for m in self.metadata], f, indent=2)
+            for meta in self.iter_metadata():
+                f.write(meta.model_dump_json())
+                f.write("\n")
+                count += 1
+        return count
+
+
+def _extract_page_range(
+    pdf_path: str, output_dir: str, page_nums: range
+) -> list[tuple[int, list[tuple[int, ImageMetadata]]]]:
+    """Process-pool worker: extract images from a range of pages.
+
+    `fitz.Document` objects cannot be shared between processes, so each worker
+    opens the PDF itself.
+    """
+    extractor = ExtractImages(pdf_path, output_dir, max_workers=1)
+    with fitz.open(pdf_path) as doc:
+        return [extractor._extract_page(doc, page_num) for page_num in page_nums]
@@ -1,15 +1,19 @@
 from __future__ import annotations
 
+import asyncio
 import base64
+import hashlib
+import io
 import json
 import logging
-from typing import Any, Dict, Optional, Sequence, Type, TypeVar
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Type, TypeVar
 
 try:
-    from google import genai
-except ImportError:  # pragma: no cover - optional unless GeminiClient is used
-    genai = None
-from openai import OpenAI
+    import pybase64
+except ImportError:  # pragma: no cover - optional SIMD speedup for base64
+    pybase64 = None
+from openai import DEFAULT_MAX_RETRIES, AsyncOpenAI, OpenAI
 from pydantic import BaseModel, ValidationError
 
 
@@ -17,6 +21,11 @@ logger = logging.getLogger(__name__)
 
 T = TypeVar("T", bound=BaseModel)
 
+# google-genai is optional and slow to import; it is loaded on first GeminiClient use
+genai: Any = None
+
+_b64decode = pybase64.b64decode if pybase64 is not None else base64.b64decode
+
 
 class OpenAIClient:
     """Simple wrapper for sending PDF + prompt payloads to the OpenAI chat completions API."""
@@ -30,6 +39,7 @@ class OpenAIClient:
         request_timeout: Optional[float] = None,
         default_headers: Optional[Dict[str, str]] = None,
         max_completion_tokens: int = 4_000,
+        max_retries: int = DEFAULT_MAX_RETRIES,
     ) -> None:
         if not api_key:
             raise ValueError("An compatible API key is required.")
@@ -37,12 +47,28 @@ class OpenAIClient:
         self.model = model
         self.request_timeout = request_timeout
         self.max_completion_tokens = max_completion_tokens
-        self.client = OpenAI(api_key=api_key, base_url=base_url, default_headers=default_headers)
+        # The SDK retries timeouts, 408/409/429 and 5xx with jittered exponential backoff
+        self.client = OpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            default_headers=default_headers,
+            max_retries=max_retries,
+        )
+        # AsyncOpenAI's connection pool is bound to the event loop that first uses it,
+        # so the `agenerate_*` methods must be awaited from one long-lived loop
+        self._async_client_options = dict(
+            api_key=api_key,
+            base_url=base_url,
+            default_headers=default_headers,
+            max_retries=max_retries,
+        )
+        self.async_client = AsyncOpenAI(**self._async_client_options)
 
-    def generate_itell_json(self, pdf_filename: str, pdf_base64: str, prompt: str) -> str:
-        """Send the encoded PDF + prompt to the model and return the JSON response text."""
+    @staticmethod
+    def _pdf_messages(pdf_filename: str, pdf_base64: str, prompt: str) -> list:
+        """Build the chat messages for an encoded PDF + prompt request."""
         data_uri = f"data:application/pdf;base64,{pdf_base64}"
-        messages = [
+        return [
             {
                 "role": "user",
                 "content": [
@@ -61,18 +87,10 @@ class OpenAIClient:
             }
         ]
 
-        logger.info("Sending PDF '%s' to %s", pdf_filename, self.model)
-        completion = self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            max_completion_tokens=self.max_completion_tokens,
-            timeout=self.request_timeout,
-        )
-        return self._extract_message_text(completion)
-
-    def generate_itell_json_from_text(self, prompt: str) -> str:
-        """Send a text-only prompt to the model and return the JSON response text."""
-        messages = [
+    @staticmethod
+    def _text_messages(prompt: str) -> list:
+        """Build the chat messages for a text-only request."""
+        return [
             {
                 "role": "user",
                 "content": [
@@ -84,8 +102,57 @@ class OpenAIClient:
             }
         ]
 
+    def generate_itell_json(self, pdf_filename: str, pdf_base64: str, prompt: str) -> str:
+        """Send the encoded PDF + prompt to the model and return the JSON response text."""
+        logger.info("Sending PDF '%s' to %s", pdf_filename, self.model)
+        completion = self.client.chat.completions.create(
+            model=self.model,
+            messages=self._pdf_messages(pdf_filename, pdf_base64, prompt),
+            max_completion_tokens=self.max_completion_tokens,
+            timeout=self.request_timeout,
+        )
+        return self._extract_message_text(completion)
+
+    def generate_itell_json_from_text(self, prompt: str) -> str:
+        """Send a text-only prompt to the model and return the JSON response text."""
         logger.info("Sending text source to %s", self.model)
         completion = self.client.chat.completions.create(
+            model=self.model,
+            messages=self._text_messages(prompt),
+            max_completion_tokens=self.max_completion_tokens,
+            timeout=self.request_timeout,
+        )
+        return self._extract_message_text(completion)
+
+    def generate_itell_json_stream(
+        self, pdf_filename: str, pdf_base64: str, prompt: str
+    ) -> Iterator[str]:
+        """Streaming `generate_itell_json`: yield the response text as it arrives."""
+        logger.info("Sending PDF '%s' to %s", pdf_filename, self.model)
+        stream = self.client.chat.completions.create(
+            model=self.model,
+            messages=self._pdf_messages(pdf_filename, pdf_base64, prompt),
+            max_completion_tokens=self.max_completion_tokens,
+            timeout=self.request_timeout,
+            stream=True,
+        )
+        yield from self._iter_stream_text(stream)
+
+    def generate_itell_json_from_text_stream(self, prompt: str) -> Iterator[str]:
+        """Streaming `generate_itell_json_from_text`."""
+        logger.info("Sending text source to %s", self.model)
+        stream = self.client.chat.completions.create(
+            model=self.model,
+            messages=self._text_messages(prompt),
+            max_completion_tokens=self.max_completion_tokens,
+            timeout=self.request_timeout,
+            stream=True,
+        )
+        yield from self._iter_stream_text(stream)
+
+    async def _acomplete(self, client: AsyncOpenAI, messages: list) -> str:
+        """Send ``messages`` through ``client`` and return the response text."""
+        completion = await client.chat.completions.create(
             model=self.model,
             messages=messages,
             max_completion_tokens=self.max_completion_tokens,
@@ -93,6 +160,92 @@ class OpenAIClient:
         )
         return self._extract_message_text(completion)
 
+    async def agenerate_itell_json(self, pdf_filename: str, pdf_base64: str, prompt: str) -> str:
+        """Async `generate_itell_json`, so many documents can be in flight at once."""
+        logger.info("Sending PDF '%s' to %s", pdf_filename, self.model)
+        return await self._acomplete(
+            self.async_client, self._pdf_messages(pdf_filename, pdf_base64, prompt)
+        )
+
+    async def agenerate_itell_json_from_text(self, prompt: str) -> str:
+        """Async `generate_itell_json_from_text`."""
+        logger.info("Sending text source to %s", self.model)
+        return await self._acomplete(self.async_client, self._text_messages(prompt))
+
+    async def agenerate_many(
+        self,
+        requests: Iterable[Tuple[str, str, str]],
+        *,
+        concurrency: int = 8,
+        client: Optional[AsyncOpenAI] = None,
+    ) -> List[str]:
+        """Run `(pdf_filename, pdf_base64, prompt)` requests concurrently, in input order.
+
+        At most ``concurrency`` requests are in flight at a time to stay within rate limits.
+        Requests go through ``client`` if given, otherwise through `async_client`.
+        """
+        client = client or self.async_client
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def run_one(pdf_filename: str, pdf_base64: str, prompt: str) -> str:
+            async with semaphore:
+                logger.info("Sending PDF '%s' to %s", pdf_filename, self.model)
+                return await self._acomplete(
+                    client, self._pdf_messages(pdf_filename, pdf_base64, prompt)
+                )
+
+        return await asyncio.gather(*(run_one(*request) for request in requests))
+
+    def generate_many(
+        self, requests: Iterable[Tuple[str, str, str]], *, concurrency: int = 8
+    ) -> List[str]:
+        """Blocking wrapper around `agenerate_many` for synchronous callers.
+
+        ``asyncio.run`` closes its loop on return, so each call uses its own `AsyncOpenAI`
+        client rather than `async_client`, which would be left bound to the closed loop.
+        """
+
+        async def run() -> List[str]:
+            async with AsyncOpenAI(**self._async_client_options) as client:
+                return await self.agenerate_many(
+                    requests, concurrency=concurrency, client=client
+                )
+
+        return asyncio.run(run())
+
+    @staticmethod
+    def _iter_stream_text(stream: Iterable[Any]) -> Iterator[str]:
+        """Yield text deltas from a streamed completion.
+
+        Leading and trailing whitespace is dropped as in `_extract_message_text`, so the
+        joined deltas equal the non-streaming result.
+        """
+        received = False
+        started = False
+        pending = ""
+        for chunk in stream:
+            choices = getattr(chunk, "choices", None)
+            if not choices:
+                continue
+            received = True
+            text = getattr(choices[0].delta, "content", None)
+            if not text:
+                continue
+            if not started:
+                text = text.lstrip()
+                if not text:
+                    continue
+                started = True
+            # Hold back trailing whitespace until more text follows it
+            stripped = text.rstrip()
+            if stripped:
+                yield pending + stripped
+                pending = ""
+            pending += text[len(stripped):]
+
+        if not received:
+            raise RuntimeError("No completion choices were returned by the API.")
+
     @staticmethod
     def _extract_message_text(completion: Any) -> str:
         """Normalize the response payload into a string for downstream use."""
@@ -107,20 +260,32 @@ class OpenAIClient:
             return content.strip()
 
         if isinstance(content, Sequence):
-            text_parts = []
-            for block in content:
-                if isinstance(block, dict):
-                    text = block.get("text")
-                else:
-                    text = getattr(block, "text", None)
-                if text:
-                    text_parts.append(text)
-            return "\n".join(text_parts).strip()
+            texts = (
+                block.get("text") if isinstance(block, dict) else getattr(block, "text", None)
+                for block in content
+            )
+            return "\n".join(text for text in texts if text).strip()
 
         return str(content).strip()
 
 
+def _load_genai() -> Any:
+    global genai
+    if genai is None:
+        try:
+            from google import genai as genai_module
+        except ImportError as exc:  # pragma: no cover - optional unless GeminiClient is used
+            raise ImportError("google-genai is required to use GeminiClient") from exc
+        genai = genai_module
+    return genai
+
+
 class GeminiClient:
+    # Files API uploads are deleted after 48 hours; re-upload before that
+    UPLOAD_TTL_SECONDS = 47 * 60 * 60
+    # Inline request payloads are capped at 20 MB, so larger PDFs always go through the Files API
+    MAX_INLINE_PDF_BYTES = 20 * 1024 * 1024
+
     def __init__(
         self,
         model: str,
@@ -128,38 +293,127 @@ class GeminiClient:
         *,
         request_timeout: Optional[float] = None,
         max_output_tokens: int = 99999,
-
+        max_retries: Optional[int] = None,
     ) -> None:
         if not api_key:
             raise ValueError("A Gemini API key is required.")
-        if genai is None:
-            raise ImportError("google-genai is required to use GeminiClient")
+        _load_genai()
 
         self.model_name = model
         self.max_output_tokens = max_output_tokens
-        http_options = genai.types.HttpOptions(timeout=request_timeout) if request_timeout else None
+        http_options = None
+        if request_timeout or max_retries:
+            # Retries use the SDK's jittered exponential backoff on retryable statuses
+            retry_options = (
+                genai.types.HttpRetryOptions(attempts=max_retries + 1) if max_retries else None
+            )
+            http_options = genai.types.HttpOptions(
+                timeout=request_timeout, retry_options=retry_options
+            )
         self.model = model
         self.client = genai.Client(
             api_key=api_key,
             http_options=http_options
         )
+        # Uploaded PDFs keyed by a digest of their bytes, with the time of the upload
+        self._uploaded_pdfs: Dict[str, Tuple[float, Any]] = {}
+        # Digests of PDFs already sent inline once; a repeat is uploaded instead
+        self._inlined_pdfs: set = set()
+
+    def __enter__(self) -> "GeminiClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Delete the PDFs this client uploaded to the Files API."""
+        for _, uploaded in self._uploaded_pdfs.values():
+            try:
+                self.client.files.delete(name=uploaded.name)
+            except Exception as e:  # the upload may already have expired
+                logger.warning("Could not delete uploaded file %s: %s", uploaded.name, e)
+        self._uploaded_pdfs.clear()
+
+    async def aclose(self) -> None:
+        """Async `close`."""
+        for _, uploaded in self._uploaded_pdfs.values():
+            try:
+                await self.client.aio.files.delete(name=uploaded.name)
+            except Exception as e:  # the upload may already have expired
+                logger.warning("Could not delete uploaded file %s: %s", uploaded.name, e)
+        self._uploaded_pdfs.clear()
+
+    def _cached_pdf(self, key: str, pdf_bytes: bytes) -> Any:
+        """Return the cached content for a PDF, or None when it needs uploading.
+
+        A PDF seen for the first time is sent inline, so a one-off conversion is a
+        single request; only repeats (and PDFs too large to inline) are uploaded.
+        """
+        cached = self._uploaded_pdfs.get(key)
+        if cached is not None:
+            uploaded_at, uploaded = cached
+            if time.monotonic() - uploaded_at < self.UPLOAD_TTL_SECONDS:
+                return uploaded
+            del self._uploaded_pdfs[key]
+        elif key not in self._inlined_pdfs and len(pdf_bytes) <= self.MAX_INLINE_PDF_BYTES:
+            self._inlined_pdfs.add(key)
+            return genai.types.Part.from_bytes(data=pdf_bytes, mime_type="application/pdf")
+        return None
+
+    def _pdf_file(self, pdf_filename: str, pdf_bytes: bytes) -> Any:
+        """Return the PDF as request content, uploading it through the Files API for reuse."""
+        key = hashlib.blake2b(pdf_bytes, digest_size=16).hexdigest()
+        content = self._cached_pdf(key, pdf_bytes)
+        if content is None:
+            logger.info("Uploading PDF '%s' to the Gemini Files API", pdf_filename)
+            content = self.client.files.upload(
+                file=io.BytesIO(pdf_bytes),
+                config=genai.types.UploadFileConfig(
+                    mime_type="application/pdf",
+                    display_name=pdf_filename,
+                ),
+            )
+            self._uploaded_pdfs[key] = (time.monotonic(), content)
+        return content
 
     def generate_itell_json(self, pdf_filename: str, pdf_base64: str, prompt: str) -> str:
-        pdf_bytes = base64.b64decode(pdf_base64)
+        return self.generate_itell_json_bytes(pdf_filename, _b64decode(pdf_base64), prompt)
 
-        pdf_part = {
-            "mime_type": "application/pdf",
-            "data": pdf_bytes
-        }
+    def generate_itell_json_bytes(self, pdf_filename: str, pdf_bytes: bytes, prompt: str) -> str:
+        """Same as `generate_itell_json`, for callers that already hold the raw PDF bytes."""
         response = self.client.models.generate_content(
             model=self.model,
-            contents=[
-                  genai.types.Part.from_bytes(
-                    data=pdf_bytes,
-                    mime_type='application/pdf',
-                  ),
-                  prompt
-              ],
+            contents=[self._pdf_file(pdf_filename, pdf_bytes), prompt],
+            config=genai.types.GenerateContentConfig(
+                max_output_tokens=self.max_output_tokens,
+            ),
+        )
+
+        return response.text.strip()
+
+    async def _apdf_file(self, pdf_filename: str, pdf_bytes: bytes) -> Any:
+        """Async `_pdf_file`, sharing the same upload cache."""
+        key = hashlib.blake2b(pdf_bytes, digest_size=16).hexdigest()
+        content = self._cached_pdf(key, pdf_bytes)
+        if content is None:
+            logger.info("Uploading PDF '%s' to the Gemini Files API", pdf_filename)
+            content = await self.client.aio.files.upload(
+                file=io.BytesIO(pdf_bytes),
+                config=genai.types.UploadFileConfig(
+                    mime_type="application/pdf",
+                    display_name=pdf_filename,
+                ),
+            )
+            self._uploaded_pdfs[key] = (time.monotonic(), content)
+        return content
+
+    async def agenerate_itell_json(self, pdf_filename: str, pdf_base64: str, prompt: str) -> str:
+        """Async `generate_itell_json`, so many documents can be in flight at once."""
+        pdf_file = await self._apdf_file(pdf_filename, _b64decode(pdf_base64))
+        response = await self.client.aio.models.generate_content(
+            model=self.model,
+            contents=[pdf_file, prompt],
             config=genai.types.GenerateContentConfig(
                 max_output_tokens=self.max_output_tokens,
             ),
@@ -171,17 +425,17 @@ class GeminiClient:
         self, pdf_filename: str, pdf_base64: str, prompt: str, response_format: Type[T]
     ) -> T:
         """Send PDF + prompt to Gemini and return structured output as Pydantic model."""
-        pdf_bytes = base64.b64decode(pdf_base64)
-        
+        return self.generate_itell_structured_bytes(
+            pdf_filename, _b64decode(pdf_base64), prompt, response_format
+        )
+
+    def generate_itell_structured_bytes(
+        self, pdf_filename: str, pdf_bytes: bytes, prompt: str, response_format: Type[T]
+    ) -> T:
+        """Same as `generate_itell_structured`, for callers that already hold the raw PDF bytes."""
         completion = self.client.models.generate_content(
             model=self.model,
-            contents=[
-                  genai.types.Part.from_bytes(
-                    data=pdf_bytes,
-                    mime_type='application/pdf',
-                  ),
-                  prompt
-              ],
+            contents=[self._pdf_file(pdf_filename, pdf_bytes), prompt],
             config=genai.types.GenerateContentConfig(
                 max_output_tokens=self.max_output_tokens,
                 response_mime_type="application/json",
@@ -199,9 +453,9 @@ class GeminiClient:
 
         try:
             cleaned_text = self._extract_json_payload(completion.text or "")
-            response_dict = json.loads(cleaned_text)
-            return response_format.model_validate(response_dict)
-        except (json.JSONDecodeError, ValidationError, ValueError) as e:
+            # pydantic-core parses and validates in one pass, without a dict tree
+            return response_format.model_validate_json(cleaned_text)
+        except (ValidationError, ValueError) as e:
             snippet = (completion.text or "")[:500]
             raise RuntimeError(
                 f"Failed to parse structured output from Gemini: {e}. Raw response (truncated): {snippet}"
@@ -231,9 +485,9 @@ class GeminiClient:
 
         try:
             cleaned_text = self._extract_json_payload(completion.text or "")
-            response_dict = json.loads(cleaned_text)
-            return response_format.model_validate(response_dict)
-        except (json.JSONDecodeError, ValidationError, ValueError) as e:
+            # pydantic-core parses and validates in one pass, without a dict tree
+            return response_format.model_validate_json(cleaned_text)
+        except (ValidationError, ValueError) as e:
             snippet = (completion.text or "")[:500]
             raise RuntimeError(
                 f"Failed to parse structured output from Gemini: {e}. Raw response (truncated): {snippet}"
@@ -252,6 +506,15 @@ class GeminiClient:
         if cleaned.endswith("```"):
             cleaned = cleaned[:-3].strip()
 
+        # Well-formed payloads: the C decoder finds where the object ends
+        first_brace = cleaned.find("{")
+        if first_brace != -1:
+            try:
+                _, end_index = json.JSONDecoder().raw_decode(cleaned, first_brace)
+                return cleaned[first_brace:end_index]
+            except json.JSONDecodeError:
+                pass
+
         # Walk the response so we only capture the balanced JSON payload even if
         # stray braces appear inside quoted text.
         start_index = None
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import os
+import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Sequence
+from typing import Iterable, Optional, Sequence, Tuple
 
 from dotenv import load_dotenv
 
@@ -22,8 +25,6 @@ try:
         select_reference_example,
     )
 except ImportError:  # pragma: no cover
-    import sys
-
     sys.path.append(str(Path(__file__).resolve().parents[1]))
     from pipeline.gemini_client import OpenAIClient  # type: ignore
     from pipeline.extract_images import ExtractImages  # type: ignore
@@ -90,6 +91,11 @@ def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
         default=None,
         help="Optional page title from the reference JSON to use as the example section.",
     )
+    parser.add_argument(
+        "--compact-example",
+        action="store_true",
+        help="Embed only one item of each kind from the reference example's lists to shorten the prompt.",
+    )
     parser.add_argument("--output", type=Path, default=None, help="Optional file path to write the LLM response JSON.")
     parser.add_argument("--model", type=str, default=None, help="Override the model name (defaults to OPENAI_MODEL env).")
     parser.add_argument("--api-key", type=str, default=None, help="Explicit API key (defaults to env OPENAI_API_KEY).")
@@ -105,15 +111,87 @@ def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
         action="store_true",
         help="By default images are extracted from PDF inputs to generate coordinate tags. Set this flag to skip extraction.",
     )
+    parser.add_argument(
+        "--image-workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes for PDF image extraction (default: CPU count; 1 extracts sequentially).",
+    )
     parser.add_argument(
         "--max-tokens",
         type=int,
         default=4_000,
         help="Maximum completion tokens for the chat.completions call.",
     )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=2,
+        help="Retries for timeouts, rate limits and server errors, with jittered exponential backoff.",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream the LLM response to --output (or stdout) as it is generated.",
+    )
+    parser.add_argument(
+        "--response-cache",
+        type=Path,
+        default=None,
+        help="Optional directory caching LLM responses by input file, model and prompt so identical reruns skip the API call.",
+    )
     return parser.parse_args(argv)
 
 
+def _response_cache_key(
+    input_path: Path, model: str, base_url: Optional[str], max_tokens: int, prompt: str
+) -> str:
+    """Content-address a request by the input file bytes and every parameter sent to the API."""
+    digest = hashlib.sha256()
+    digest.update(hashlib.sha256(input_path.read_bytes()).digest())
+    for part in (model, base_url or "", str(max_tokens), prompt):
+        digest.update(b"\0")
+        digest.update(part.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _emit_stream(deltas: Iterable[str], output: Optional[Path]) -> str:
+    """Write streamed response text to ``output`` (or stdout) as it arrives and return it in full."""
+    parts = []
+    if output is None:
+        for delta in deltas:
+            parts.append(delta)
+            print(delta, end="", flush=True)
+        print()
+    else:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with output.open("w", encoding="utf-8") as handle:
+            for delta in deltas:
+                parts.append(delta)
+                handle.write(delta)
+    return "".join(parts)
+
+
+@lru_cache(maxsize=8)
+def _get_client(
+    model: str,
+    api_key: str,
+    base_url: Optional[str],
+    max_completion_tokens: int,
+    default_headers: Optional[Tuple[Tuple[str, str], ...]],
+    max_retries: int,
+) -> OpenAIClient:
+    """Reuse clients, and their pooled keep-alive connections, across main() calls in one process."""
+    return OpenAIClient(
+        model=model,
+        api_key=api_key,
+        base_url=base_url,
+        max_completion_tokens=max_completion_tokens,
+        default_headers=dict(default_headers) if default_headers else None,
+        max_retries=max_retries,
+    )
+
+
 def main(argv: Optional[Sequence[str]] = None) -> str:
     load_dotenv()
     args = parse_args(argv)
@@ -134,7 +212,9 @@ def main(argv: Optional[Sequence[str]] = None) -> str:
 
     image_metadata_text = None
     if input_suffix == ".pdf" and not args.skip_image_extraction:
-        extractor = ExtractImages(str(input_path), str(args.image_dir))
+        extractor = ExtractImages(
+            str(input_path), str(args.image_dir), max_workers=args.image_workers
+        )
         image_metadata = extractor.extract_img()
         extractor.save_metadata(str(args.image_dir / "metadata.json"))
         image_metadata_text = format_image_metadata(image_metadata) or None
@@ -149,6 +229,7 @@ def main(argv: Optional[Sequence[str]] = None) -> str:
         image_metadata_text=image_metadata_text,
         source_text=source_text,
         source_name=input_path.name if source_text else None,
+        compact_example=args.compact_example,
     )
 
     openai_key = os.getenv("OPENAI_API_KEY")
@@ -191,29 +272,55 @@ def main(argv: Optional[Sequence[str]] = None) -> str:
             headers["X-Title"] = app_name
         default_headers = headers or None
 
-    client = OpenAIClient(
-        model=model,
-        api_key=api_key,
-        base_url=base_url,
-        max_completion_tokens=args.max_tokens,
-        default_headers=default_headers,
+    client = _get_client(
+        model,
+        api_key,
+        base_url,
+        args.max_tokens,
+        tuple(sorted(default_headers.items())) if default_headers else None,
+        args.max_retries,
     )
 
-    if input_suffix == ".pdf":
-        pdf_b64 = encode_pdf_to_base64(input_path)
-        result_json = client.generate_itell_json(
-            pdf_filename=input_path.name,
-            pdf_base64=pdf_b64,
-            prompt=prompt,
-        )
+    cache_path = None
+    if args.response_cache:
+        cache_key = _response_cache_key(input_path, model, base_url, args.max_tokens, prompt)
+        cache_path = args.response_cache / f"{cache_key}.json"
+
+    streamed = False
+    if cache_path is not None and cache_path.exists():
+        print(f"Using cached LLM response from {cache_path}", file=sys.stderr)
+        result_json = cache_path.read_text(encoding="utf-8")
     else:
-        result_json = client.generate_itell_json_from_text(prompt=prompt)
+        if input_suffix == ".pdf":
+            pdf_b64 = encode_pdf_to_base64(input_path)
+            request = {
+                "pdf_filename": input_path.name,
+                "pdf_base64": pdf_b64,
+                "prompt": prompt,
+            }
+            generate = client.generate_itell_json
+            generate_stream = client.generate_itell_json_stream
+        else:
+            request = {"prompt": prompt}
+            generate = client.generate_itell_json_from_text
+            generate_stream = client.generate_itell_json_from_text_stream
+
+        if args.stream:
+            result_json = _emit_stream(generate_stream(**request), args.output)
+            streamed = True
+        else:
+            result_json = generate(**request)
+
+        if cache_path is not None:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            cache_path.write_text(result_json, encoding="utf-8")
 
     if args.output:
-        args.output.parent.mkdir(parents=True, exist_ok=True)
-        args.output.write_text(result_json, encoding="utf-8")
+        if not streamed:
+            args.output.parent.mkdir(parents=True, exist_ok=True)
+            args.output.write_text(result_json, encoding="utf-8")
         print(f"Wrote LLM response to {args.output}")
-    else:
+    elif not streamed:
         print(result_json)
 
     return result_json
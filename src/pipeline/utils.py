@@ -2,13 +2,24 @@ from __future__ import annotations
 
 import base64
 import json
+import os
 import re
-import textwrap
 import zipfile
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, Optional, Sequence
 from xml.etree import ElementTree
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional; falls back to the stdlib json
+    orjson = None
+
+try:
+    import pybase64
+except ImportError:  # pragma: no cover - optional SIMD speedup for base64
+    pybase64 = None
+
 __all__ = [
     "build_conversion_prompt",
     "build_mode_guide_text",
@@ -28,6 +39,9 @@ def load_reference_json(reference_path: Path) -> Dict[str, Any]:
     if not reference_path.exists():
         raise FileNotFoundError(f"Reference JSON not found at {reference_path}")
 
+    if orjson is not None:
+        return orjson.loads(reference_path.read_bytes())
+
     with reference_path.open("r", encoding="utf-8") as handle:
         return json.load(handle)
 
@@ -38,25 +52,20 @@ def load_guide_instructions(guide_path: Path) -> str:
     if not guide_path.exists():
         raise FileNotFoundError(f"Guide file not found at {guide_path}")
 
+    stat = guide_path.stat()
+    return _load_guide_instructions(str(guide_path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=32)
+def _load_guide_instructions(path: str, mtime_ns: int, size: int) -> str:
+    # mtime_ns and size only key the cache, so an edited guide is re-read
+    guide_path = Path(path)
     suffix = guide_path.suffix.lower()
     if suffix in {".md", ".txt"}:
         return guide_path.read_text(encoding="utf-8").strip()
 
     if suffix == ".docx":
-        try:
-            from docx import Document  # type: ignore import
-        except ImportError as exc:  # pragma: no cover
-            raise ImportError(
-                "python-docx is required to parse .docx instruction files"
-            ) from exc
-
-        document = Document(str(guide_path))
-        paragraphs = [
-            paragraph.text.strip()
-            for paragraph in document.paragraphs
-            if paragraph.text.strip()
-        ]
-        return "\n".join(paragraphs)
+        return "\n".join(_extract_docx_paragraphs(guide_path))
 
     raise ValueError(
         f"Unsupported guide format '{suffix}'. Expected .md, .txt, or .docx"
@@ -95,8 +104,22 @@ def encode_pdf_to_base64(pdf_path: Path) -> str:
     if not pdf_path.exists():
         raise FileNotFoundError(f"PDF not found at {pdf_path}")
 
+    # Encode in blocks straight into a preallocated buffer so the raw PDF and
+    # the intermediate base64 bytes are never held in full alongside the result.
+    b64encode = pybase64.b64encode if pybase64 is not None else base64.b64encode
+    block_size = 3 * 16 * 1024  # multiple of 3: no padding between blocks
+    encoded = bytearray(4 * -(-pdf_path.stat().st_size // 3))
+    offset = 0
     with pdf_path.open("rb") as handle:
-        return base64.b64encode(handle.read()).decode("utf-8")
+        if hasattr(os, "posix_fadvise"):
+            # Ask for aggressive readahead on cold-cache reads of large PDFs
+            os.posix_fadvise(handle.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        while block := handle.read(block_size):
+            chunk = b64encode(block)
+            encoded[offset:offset + len(chunk)] = chunk
+            offset += len(chunk)
+    del encoded[offset:]
+    return encoded.decode("ascii")
 
 
 def extract_pptx_outline_text(pptx_path: Path) -> str:
@@ -171,6 +194,63 @@ def _extract_pptx_xml_text(xml_bytes: bytes) -> list[str]:
     return lines
 
 
+_WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_PACKAGE_RELS_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+
+def _extract_docx_paragraphs(docx_path: Path) -> list[str]:
+    """Return the non-empty body paragraphs of a DOCX, as python-docx's ``paragraph.text``."""
+    try:
+        with zipfile.ZipFile(docx_path) as archive:
+            document_name = "word/document.xml"
+            rels = ElementTree.fromstring(archive.read("_rels/.rels"))
+            for rel in rels.iter(f"{_PACKAGE_RELS_NS}Relationship"):
+                if rel.get("Type", "").endswith("/officeDocument"):
+                    document_name = rel.get("Target", document_name).lstrip("/")
+                    break
+            root = ElementTree.fromstring(archive.read(document_name))
+    except (zipfile.BadZipFile, KeyError) as exc:
+        raise ValueError(f"Invalid DOCX file at {docx_path}") from exc
+
+    body = root.find(f"{_WORD_NS}body")
+    if body is None:
+        return []
+
+    paragraphs = []
+    # Only top-level body paragraphs, matching Document.paragraphs (no table cells)
+    for paragraph in body.iterfind(f"{_WORD_NS}p"):
+        parts = []
+        for child in paragraph:
+            if child.tag == f"{_WORD_NS}r":
+                runs = (child,)
+            elif child.tag == f"{_WORD_NS}hyperlink":
+                runs = child.iterfind(f"{_WORD_NS}r")
+            else:
+                continue
+            for run in runs:
+                parts.extend(_docx_run_text(element) for element in run)
+        text = "".join(parts).strip()
+        if text:
+            paragraphs.append(text)
+    return paragraphs
+
+
+def _docx_run_text(element: ElementTree.Element) -> str:
+    tag = element.tag
+    if tag == f"{_WORD_NS}t":
+        return element.text or ""
+    if tag in (f"{_WORD_NS}tab", f"{_WORD_NS}ptab"):
+        return "\t"
+    if tag == f"{_WORD_NS}cr":
+        return "\n"
+    if tag == f"{_WORD_NS}br":
+        # Page and column breaks carry no text; line breaks do
+        return "\n" if element.get(f"{_WORD_NS}type", "textWrapping") == "textWrapping" else ""
+    if tag == f"{_WORD_NS}noBreakHyphen":
+        return "-"
+    return ""
+
+
 def select_reference_example(
     reference_json: Dict[str, Any], example_title: Optional[str] = None
 ) -> Any:
@@ -243,47 +323,81 @@ def format_image_metadata(image_metadata: Sequence[Dict[str, Any]]) -> str:
     return "\n".join(lines)
 
 
+def _skeletonize_example(value: Any) -> Any:
+    """Shrink an example by keeping the first list item of each kind (type + ``__component``)."""
+    if isinstance(value, dict):
+        return {key: _skeletonize_example(item) for key, item in value.items()}
+    if isinstance(value, list):
+        kept: Dict[Any, Any] = {}
+        for item in value:
+            kind = (type(item).__name__, item.get("__component") if isinstance(item, dict) else None)
+            if kind not in kept:
+                kept[kind] = _skeletonize_example(item)
+        return list(kept.values())
+    return value
+
+
+def _dump_example_json(example_json: Any) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(example_json, option=orjson.OPT_INDENT_2).decode("utf-8")
+        except TypeError:  # orjson.JSONEncodeError, e.g. non-str keys or huge ints
+            pass
+    return json.dumps(example_json, indent=2, ensure_ascii=False)
+
+
 def build_conversion_prompt(
     guide_text: str,
     example_json: Any,
     image_metadata_text: Optional[str] = None,
     source_text: Optional[str] = None,
     source_name: Optional[str] = None,
+    compact_example: bool = False,
 ) -> str:
-    """Create the LLM prompt by combining guide instructions with a JSON example."""
+    """Create the LLM prompt by combining guide instructions with a JSON example.
+
+    With ``compact_example`` the example keeps only one list item of each kind, which
+    preserves its structure while cutting prompt tokens for large reference volumes.
+    """
     if not guide_text.strip():
         raise ValueError("Guide instructions are empty; cannot craft a prompt.")
 
-    example_json_str = json.dumps(example_json, indent=2, ensure_ascii=False)
-
-    template = f"""
-    Your Role: iTELL Content Authoring Expert
-    You are a specialized AI assistant expert in the iTELL framework. Your primary function is to convert source documents into perfectly structured iTELL JSON files.
-
-    GUIDE TO iTELL JSON:
-    {guide_text.strip()}
-
-    REFERENCE iTELL JSON:
-    ```json
-    {example_json_str}
-    ```
-
-    Carefully analyze the provided source document and convert it into iTELL JSON.
-    Only return JSON that adheres to the example schema and instructions above."""
+    if compact_example:
+        example_json = _skeletonize_example(example_json)
+    example_json_str = _dump_example_json(example_json)
+
+    # Assemble flush-left lines directly rather than dedenting one big template
+    parts = [
+        "Your Role: iTELL Content Authoring Expert",
+        "You are a specialized AI assistant expert in the iTELL framework. Your primary function is to convert source documents into perfectly structured iTELL JSON files.",
+        "",
+        "GUIDE TO iTELL JSON:",
+        guide_text.strip(),
+        "",
+        "REFERENCE iTELL JSON:",
+        "```json",
+        example_json_str,
+        "```",
+        "",
+        "Carefully analyze the provided source document and convert it into iTELL JSON.",
+        "Only return JSON that adheres to the example schema and instructions above.",
+    ]
 
     if source_text:
         source_label = f" ({source_name})" if source_name else ""
-        template += f"""
-
-    SOURCE DOCUMENT TRANSCRIPT{source_label}:
-    ```text
-    {source_text.strip()}
-    ```"""
+        parts += [
+            "",
+            f"SOURCE DOCUMENT TRANSCRIPT{source_label}:",
+            "```text",
+            source_text.strip(),
+            "```",
+        ]
 
     if image_metadata_text:
-        template += f"""
-
-    EXTRACTED IMAGES WITH CONTEXT:
-    {image_metadata_text}"""
+        parts += [
+            "",
+            "EXTRACTED IMAGES WITH CONTEXT:",
+            image_metadata_text,
+        ]
 
-    return textwrap.dedent(template).strip()
+    return "\n".join(parts).strip()
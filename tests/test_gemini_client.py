@@ -0,0 +1,70 @@
+import json
+import sys
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from pipeline.gemini_client import OpenAIClient  # noqa: E402
+
+
+class _ChatCompletionHandler(BaseHTTPRequestHandler):
+    """Answer every chat completion with the PDF filename from the request."""
+
+    # Keep-alive, so the client pools connections between calls as with a real API
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        filename = request["messages"][0]["content"][0]["file"]["filename"]
+        body = json.dumps(
+            {
+                "id": "chatcmpl-test",
+                "object": "chat.completion",
+                "created": 0,
+                "model": request["model"],
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": f'{{"file": "{filename}"}}'},
+                        "finish_reason": "stop",
+                    }
+                ],
+            }
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class GenerateManyTest(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _ChatCompletionHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.client = OpenAIClient(
+            "test-model",
+            "test-key",
+            base_url=f"http://127.0.0.1:{self.server.server_port}/v1",
+            max_retries=0,
+        )
+
+    def test_generate_many_can_be_called_twice(self):
+        requests = [(f"doc{i}.pdf", "JVBERi0=", "prompt") for i in range(3)]
+        expected = [f'{{"file": "doc{i}.pdf"}}' for i in range(3)]
+
+        self.assertEqual(self.client.generate_many(requests, concurrency=2), expected)
+        # Each call runs in a fresh event loop, so the client must not reuse the last one's pool
+        self.assertEqual(self.client.generate_many(requests, concurrency=2), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()